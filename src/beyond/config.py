@@ -27,19 +27,20 @@ class Config(dict):
         give the fallback value specified.
         """
 
-        fullkeys = list(keys).copy()
-
-        section, *keys = keys
-        out = super().get(section, fallback)
+        # This is called for each Date object created, so the keys are
+        # walked by index instead of copying and consuming them
+        out = super().get(keys[0], fallback)
 
+        i = 1
         while isinstance(out, dict):
-            key = keys.pop(0)
+            key = keys[i]
             out = out.get(key, fallback)
+            i += 1
 
-        if keys and out is not fallback:
+        if i < len(keys) and out is not fallback:
             raise ConfigError(
                 "Dict structure mismatch : Looked for '{}', stopped at '{}'".format(
-                    ".".join(fullkeys), key
+                    ".".join(keys), key
                 )
             )
 
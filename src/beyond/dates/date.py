@@ -363,10 +363,14 @@ class Date:
         Return:
             Date: new Date object representing the same instant, with a different timescale
         """
-        offset = self.scale.offset(self._mjd, new_scale, self.eop)
-        result = self.datetime + timedelta(seconds=offset)
-
-        return self.__class__(result, scale=new_scale)
+        # As Date objects are immutable, the result of the conversion can be
+        # kept and shared between all the callers asking for the same scale
+        key = f"scale_{new_scale}"
+        if key not in self._cache.keys():
+            offset = self.scale.offset(self._mjd, new_scale, self.eop)
+            result = self.datetime + timedelta(seconds=offset)
+            self._cache[key] = self.__class__(result, scale=new_scale)
+        return self._cache[key]
 
     @classmethod
     def _julian_century(cls, jd):
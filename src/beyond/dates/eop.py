@@ -241,9 +241,10 @@ class EopDb:
             else:
                 msg = str(e)
 
-            if cls.policy() == cls.WARN:
+            policy = cls.policy()
+            if policy == cls.WARN:
                 log.warning(msg)
-            elif cls.policy() == cls.ERROR:
+            elif policy == cls.ERROR:
                 raise
 
             value = Eop(
@@ -106,7 +106,11 @@ class Frame:
         )
         m = self.orientation.convert_to(orbit.date, new_frame.orientation)
 
-        new_orb[:] = m @ new_orb + offset
+        # Working on the bare array avoids the creation of intermediate
+        # StateVector objects (and the copy of their metadata)
+        coord = m @ new_orb.base
+        coord += offset
+        new_orb[:] = coord
         new_orb._frame = new_frame
         new_orb.form = orbit.form
         return new_orb
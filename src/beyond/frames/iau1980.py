@@ -6,7 +6,6 @@
 from pathlib import Path
 
 import numpy as np
-from math import sin, cos, radians
 
 from ..utils.matrix import rot1, rot2, rot3
 from ..utils.memoize import memoize
@@ -14,11 +13,17 @@ from ..utils.memoize import memoize
 
 @memoize
 def _tab(max_i=None):
-    """Extraction and caching of IAU1980 nutation coefficients"""
+    """Extraction and caching of IAU1980 nutation coefficients
+
+    Return:
+        tuple: 2-elements, integer multipliers of the fundamental arguments
+            (N x 5 array) and longitude/obliquity amplitudes in degrees
+            (N x 4 array)
+    """
 
     filepath = Path(__file__).parent / "data" / "tab5.1.txt"
 
-    result = []
+    integers, reals = [], []
     with filepath.open(encoding="utf-8") as fhd:
         i = 0
         for line in fhd.read().splitlines():
@@ -26,15 +31,16 @@ def _tab(max_i=None):
                 continue
 
             fields = line.split()
-            result.append(
-                ([int(x) for x in fields[:5]], [float(x) for x in fields[6:]])
-            )
+            integers.append([int(x) for x in fields[:5]])
+            reals.append([float(x) for x in fields[6:]])
 
             i += 1
             if max_i and i >= max_i:
                 break
 
-    return result
+    # The amplitudes are given in 0.0001 arcsecond, and converted once and for all
+    # in degrees
+    return np.array(integers, dtype=np.int8), np.array(reals) / 36000000.0
 
 
 def rate(date):
@@ -147,16 +153,14 @@ def _nutation(date, eop_correction=True, terms=106):
         + 2.2e-6 * ttt**3
     )
 
-    delta_psi = 0.0
-    delta_eps = 0.0
-    for integers, reals in _tab(terms):
-        a1, a2, a3, a4, a5 = integers
-        A, B, C, D = reals
+    integers, reals = _tab(terms)
+    A, B, C, D = reals.T
 
-        a_p = a1 * m_m + a2 * m_s + a3 * u_m_m + a4 * d_s + a5 * om_m
+    # Only the fundamental arguments are converted to radians, not each term
+    a_p = integers @ np.radians([m_m, m_s, u_m_m, d_s, om_m])
 
-        delta_psi += (A + B * ttt) * sin(radians(a_p)) / 36000000.0
-        delta_eps += (C + D * ttt) * cos(radians(a_p)) / 36000000.0
+    delta_psi = float((A + B * ttt) @ np.sin(a_p))
+    delta_eps = float((C + D * ttt) @ np.cos(a_p))
 
     if eop_correction:
         delta_eps += date.eop.deps / 3600000.0
@@ -4,8 +4,8 @@
 from pathlib import Path
 
 import numpy as np
-from math import sin, cos
 
+from ..config import config
 from ..utils.matrix import rot1, rot2, rot3
 from ..utils.memoize import memoize
 
@@ -14,7 +14,13 @@ __all__ = ["sideral", "precesion_nutation", "earth_orientation", "rate"]
 
 @memoize
 def _tab():
-    """Extraction and caching of IAU2000 nutation coefficients"""
+    """Extraction and caching of IAU2000 nutation coefficients
+
+    Return:
+        list: For each of X, Y and s, a list of 5 tuples (one per power of t)
+            containing the sin/cos amplitudes (N x 2 array) and the integer
+            multipliers of the fundamental arguments (N x 14 array)
+    """
 
     elements = ["tab5.2a.txt", "tab5.2b.txt", "tab5.2d.txt"]  # x  # y  # s
 
@@ -31,17 +37,42 @@ def _tab():
                     continue
 
                 if line.startswith("j = "):
-                    result = []
-                    total.append(result)
+                    amplitudes, multipliers = [], []
+                    total.append((amplitudes, multipliers))
                     continue
 
                 # The first field is only an index
                 fields = line.split()[1:]
-                fields[:2] = [float(x) for x in fields[:2]]
-                fields[2:] = [int(x) for x in fields[2:]]
-                result.append(fields)
+                amplitudes.append([float(x) for x in fields[:2]])
+                multipliers.append([int(x) for x in fields[2:]])
 
-        out.append(total)
+        out.append([(np.array(a), np.array(m, dtype=np.int8)) for a, m in total])
+
+    return out
+
+
+ABRIDGED_THRESHOLD = 100.0
+"""Amplitude (in micro-arcsecond) under which a term of the series is discarded
+by the abridged model"""
+
+
+@memoize
+def _abridged_tab():
+    """Abridged version of the IAU2000 nutation coefficients
+
+    Only the terms whose amplitude is above :py:data:`ABRIDGED_THRESHOLD` are kept,
+    which reduces the series from ~2900 terms to ~150, for an error on X and Y
+    below 1 milli-arcsecond between 1990 and 2040. This is the same level of
+    accuracy as the IAU2000B model.
+    """
+
+    out = []
+    for total in _tab():
+        abridged = []
+        for amplitudes, multipliers in total:
+            kept = np.hypot(*amplitudes.T) >= ABRIDGED_THRESHOLD
+            abridged.append((amplitudes[kept], multipliers[kept]))
+        out.append(abridged)
 
     return out
 
@@ -162,12 +193,22 @@ def _planets(date):
     return planets
 
 
+def _series(tab, planets):
+    """Sum of the periodic terms of one of the tables of :py:func:`_tab`"""
+    amplitudes, multipliers = tab
+    args = multipliers @ planets
+    return float(amplitudes[:, 0] @ np.sin(args) + amplitudes[:, 1] @ np.cos(args))
+
+
 def _xysxy2(date):
     """Here we deviate from what has been done everywhere else. Instead of taking the formulas
     available in the Vallado, we take those described in the files tab5.2{a,b,d}.txt.
 
     The result should be equivalent, but they are the last iteration of the IAU2000A as of June 2016
 
+    If the ``env.iau_model`` configuration field is set to ``"B"``, the series are
+    truncated (see :py:func:`_abridged_tab`).
+
     Args:
         date (Date)
     Return:
@@ -175,7 +216,11 @@ def _xysxy2(date):
     """
 
     planets = _planets(date)
-    x_tab, y_tab, s_tab = _tab()
+
+    if config.get("env", "iau_model", fallback="A") == "B":
+        x_tab, y_tab, s_tab = _abridged_tab()
+    else:
+        x_tab, y_tab, s_tab = _tab()
 
     ttt = date.change_scale("TT").julian_century
 
@@ -208,18 +253,7 @@ def _xysxy2(date):
     )
 
     for j in range(5):
-        _x, _y, _s = 0, 0, 0
-        for Axs, Axc, *p_coefs in x_tab[j]:
-            ax_p = np.dot(p_coefs, planets)
-            _x += Axs * sin(ax_p) + Axc * cos(ax_p)
-
-        for Ays, Ayc, *p_coefs in y_tab[j]:
-            ay_p = np.dot(p_coefs, planets)
-            _y += Ays * sin(ay_p) + Ayc * cos(ay_p)
-
-        for Ass, Asc, *p_coefs in s_tab[j]:
-            as_p = np.dot(p_coefs, planets)
-            _s += Ass * sin(as_p) + Asc * cos(as_p)
+        _x, _y, _s = (_series(tab[j], planets) for tab in (x_tab, y_tab, s_tab))
 
         X += _x * ttt**j
         Y += _y * ttt**j
@@ -259,10 +293,19 @@ def precesion_nutation(date):
     d = np.arctan(np.sqrt((X**2 + Y**2) / (1 - X**2 - Y**2)))
     a = 1 / (1 + np.cos(d))
 
-    return np.array(
+    m = np.array(
         [
             [1 - a * X**2, -a * X * Y, X],
             [-a * X * Y, 1 - a * Y**2, Y],
             [-X, -Y, 1 - a * (X**2 + Y**2)],
         ]
-    ) @ rot3(s)
+    )
+
+    # Equivalent to ``m @ rot3(s)``, as only the first two columns are affected
+    # by this rotation
+    cos_s, sin_s = np.cos(s), np.sin(s)
+    c0 = m[:, 0] * cos_s - m[:, 1] * sin_s
+    c1 = m[:, 0] * sin_s + m[:, 1] * cos_s
+    m[:, 0], m[:, 1] = c0, c1
+
+    return m
@@ -51,8 +51,7 @@ class LagrangeOrient(Orientation):
         self.frame1 = frame1
         self.body2 = body2
 
-        mtd = f"{name}_to_{frame1.orientation.name}"
-        setattr(Orientation, mtd, self._to_parent)
+        self._add_transition(name, frame1.orientation.name, self._to_parent)
         frame1.orientation + self
 
     def _to_parent(self, date):
@@ -1,17 +1,101 @@
+import re
+from functools import lru_cache, partial, wraps
+
 import numpy as np
 
+from ..config import config
+from ..utils.memoize import memoize
 from ..utils.node import Node
-from ..utils.matrix import rot2, rot3, expand
+from ..utils.matrix import rot2, rot3, _rate2mat
 from . import iau1980, iau2010, local
 
+# Constant rotation matrices, shared by all calls of the corresponding transitions
+_G50_EME2000_M = np.array(
+    [
+        [0.9999256794956877, -0.0111814832204662, -0.0048590038153592],
+        [0.0111814832391717, 0.9999374848933135, -0.0000271625947142],
+        [0.0048590037723143, -0.0000271702937440, 0.9999881946023742],
+    ]
+)
+_G50_EME2000_M.setflags(write=False)
+
+_GCRF_EME2000_M = np.array(
+    [
+        [
+            0.9999_9999_9999_9942,
+            0.0000_0007_0782_7948,
+            -0.0000_0008_0562_1738,
+        ],
+        [
+            -0.0000_0007_0782_7974,
+            0.9999_9999_9999_9969,
+            -0.0000_0003_3060_4088,
+        ],
+        [
+            0.0000_0008_0562_1715,
+            0.0000_0003_3060_4145,
+            0.9999_9999_9999_9962,
+        ],
+    ]
+)
+_GCRF_EME2000_M.setflags(write=False)
+
+
+def _date_cache(func):
+    """Cache the result of a transformation depending only on the date
+
+    The 3x3 matrix and the rate vector are set as read-only, as they are shared
+    between all callers.
+    """
+
+    @lru_cache(maxsize=4096)
+    def cached(date, eop, iau_model):
+        result = func(None, date)
+        for x in result:
+            if x is not None:
+                x.setflags(write=False)
+        return result
+
+    @wraps(func)
+    def wrapper(self, date):
+        iau_model = config.get("env", "iau_model", fallback="A")
+        return cached(date, date.eop, iau_model)
+
+    return wrapper
+
 
 class Orientation(Node):
     """Rotation matrix generator for frame transformation handling"""
 
+    _transitions = {}
+    """Mapping of the (from, to) name pairs to the function providing the
+    corresponding rotation matrix and rate, and whether it should be inverted.
+    """
+
+    @classmethod
+    def _add_transition(cls, name, parent_name, func):
+        """Register a transformation between two orientations
+
+        Args:
+            name (str): Name of the source orientation
+            parent_name (str): Name of the target orientation
+            func (Callable): function taking a date as argument and returning
+                a 3x3 rotation matrix and the rotation rate (or None)
+        """
+        setattr(Orientation, f"{name}_to_{parent_name}", func)
+        cls._transitions[(name, parent_name)] = (func, False)
+        cls._transitions[(parent_name, name)] = (func, True)
+
     def convert_to(self, date, new_orient):
         """Provide the rotation matrix to transform a vector in a given orientation (self)
         to another (new_orient)
 
+        The matrices of the builtin transformations depend only on the date and
+        are cached, so requesting the same transformation at the same date (e.g.
+        for multiple satellites on the same time grid) only computes them once.
+        The complete chain is not cached, as some orientations (e.g.
+        :py:class:`LocalOrbitalOrientation`) depend on mutable objects.
+
         Args:
             date (Date):
             new_orient (str or Orientation)
@@ -22,85 +106,149 @@ class Orientation(Node):
         if isinstance(new_orient, self.__class__):
             new_orient = new_orient.name
 
-        m = np.identity(6)
+        path = tuple(self.path(new_orient))
+
+        return self._convert_to(date, path)
+
+    def convert_to_batch(self, dates, new_orient):
+        """Provide the rotation matrices to transform a vector in a given orientation
+        (self) to another (new_orient), for multiple dates at once
+
+        Args:
+            dates (List[Date]):
+            new_orient (str or Orientation)
+        return:
+            numpy.ndarray: Nx6x6 array of rotation matrices
+
+        The path between the two orientations is only resolved once, and the
+        matrices of all dates are combined with stacked products.
+        """
+
+        if isinstance(new_orient, self.__class__):
+            new_orient = new_orient.name
+
+        path = tuple(self.path(new_orient))
+
+        return self._convert_to(list(dates), path, batch=True)
+
+    def _convert_to(self, date, path, batch=False):
+        """Computation of the rotation matrix along a path, see :py:meth:`convert_to`
+
+        If ``batch`` is True, ``date`` is a list of dates, and all the matrices
+        handled have an additional leading dimension.
+        """
 
-        for a, b in self.steps(new_orient):
-            direct = f"{a}_to_{b}"
-            reverse = f"{b}_to_{a}"
+        # The 6x6 matrices are of the form [[R, 0], [D, R]], so the product
+        # of two of them only involves their R and D 3x3 blocks.
+        # D is kept to None as long as no rotation rate is involved, and R
+        # to None until the first step, in order to skip useless products
+        # with the identity matrix
+        R = None
+        D = None
+
+        for a, b in zip(path[:-1], path[1:]):
+            try:
+                func, reverse = self._transitions[(a, b)]
+            except KeyError:
+                func, reverse = self._find_transition(a, b)
+
+            if batch:
+                m, rate = zip(*(func(x) for x in date))
+                m = np.array(m)
+                rate = None if rate[0] is None else np.array(rate)
+            else:
+                m, rate = func(date)
 
-            if hasattr(self, direct):
-                M = expand(*getattr(self, direct)(date))
-            elif hasattr(self, reverse):
-                M = np.linalg.inv(expand(*getattr(self, reverse)(date)))
+            if reverse:
+                # The inverse of [[m, 0], [-m W, m]] is [[m.T, 0], [W m.T, m.T]]
+                m = m.swapaxes(-1, -2)
+                d = None if rate is None else _rate2mat(rate) @ m
             else:
-                raise ValueError(f"Unknown transformation {a} <-> {b}")
+                d = None if rate is None else -m @ _rate2mat(rate)
+
+            if R is None:
+                R, D = m, d
+                continue
+
+            if D is not None:
+                D = m @ D if d is None else d @ R + m @ D
+            elif d is not None:
+                D = d @ R
+
+            R = m @ R
+
+        if R is None:
+            R = np.identity(3)
 
-            m = M @ m
+        # Each block is written once, instead of zero-filling the whole matrix
+        out = np.empty((len(date), 6, 6) if batch else (6, 6))
+        out[..., :3, :3] = R
+        out[..., 3:, 3:] = R
+        out[..., :3, 3:] = 0.0
+        out[..., 3:, :3] = 0.0 if D is None else D
 
-        return m
+        return out
 
+    def _find_transition(self, a, b):
+        """Retrieve a transformation defined as a '<a>_to_<b>' method, but not
+        registered via :py:meth:`_add_transition`
+        """
+        if hasattr(self, f"{a}_to_{b}"):
+            return getattr(self, f"{a}_to_{b}"), False
+        elif hasattr(self, f"{b}_to_{a}"):
+            return getattr(self, f"{b}_to_{a}"), True
+        else:
+            raise ValueError(f"Unknown transformation {a} <-> {b}")
+
+    @_date_cache
     def TEME_to_TOD(self, date):
         equin = iau1980.equinox(date, eop_correction=False, terms=4, kinematic=False)
         return rot3(-np.deg2rad(equin)), None
 
+    @_date_cache
     def PEF_to_TOD(self, date):
         m = iau1980.sideral(date, model="apparent", eop_correction=False)
         return m, -iau1980.rate(date)
 
+    @_date_cache
     def TOD_to_MOD(self, date):
         return iau1980.nutation(date, eop_correction=False), None
 
+    @_date_cache
     def MOD_to_EME2000(self, date):
         return iau1980.precesion(date), None
 
+    @_date_cache
     def ITRF_to_PEF(self, date):
         return iau1980.earth_orientation(date), None
 
+    @_date_cache
     def ITRF_to_TIRF(self, date):
         return iau2010.earth_orientation(date), None
 
+    @_date_cache
     def TIRF_to_CIRF(self, date):
         m = iau2010.sideral(date)
         return m, -iau2010.rate(date)
 
+    @_date_cache
     def CIRF_to_GCRF(self, date):
         return iau2010.precesion_nutation(date), None
 
     def G50_to_EME2000(self, date):
-        return (
-            np.array(
-                [
-                    [0.9999256794956877, -0.0111814832204662, -0.0048590038153592],
-                    [0.0111814832391717, 0.9999374848933135, -0.0000271625947142],
-                    [0.0048590037723143, -0.0000271702937440, 0.9999881946023742],
-                ]
-            ),
-            None,
-        )
+        return _G50_EME2000_M, None
 
     def GCRF_to_EME2000(self, date):
-        return (
-            np.array(
-                [
-                    [
-                        0.9999_9999_9999_9942,
-                        0.0000_0007_0782_7948,
-                        -0.0000_0008_0562_1738,
-                    ],
-                    [
-                        -0.0000_0007_0782_7974,
-                        0.9999_9999_9999_9969,
-                        -0.0000_0003_3060_4088,
-                    ],
-                    [
-                        0.0000_0008_0562_1715,
-                        0.0000_0003_3060_4145,
-                        0.9999_9999_9999_9962,
-                    ],
-                ]
-            ),
-            None,
-        )
+        return _GCRF_EME2000_M, None
+
+
+for _name, _func in list(vars(Orientation).items()):
+    _match = re.fullmatch(r"([A-Z]\w*)_to_(\w+)", _name)
+    if _match:
+        # None of these methods depend on the instance
+        Orientation._add_transition(*_match.groups(), partial(_func, None))
+
+del _name, _func, _match
 
 
 TEME = Orientation("TEME")
@@ -120,6 +268,19 @@ TOD + TEME
 ITRF + TIRF + CIRF + GCRF
 
 
+@memoize
+def _topocentric_matrix(lat, lon):
+    """Rotation matrix of a topocentric orientation, depending only on the
+    latitude and longitude of the station
+    """
+
+    # the 'rot3(np.pi)' is here to place the X axis along the north direction
+    m = rot3(-lon) @ rot2(lat - np.pi / 2.0) @ rot3(np.pi)
+    # The matrix is shared between all stations and calls, and should not be altered
+    m.setflags(write=False)
+    return m
+
+
 class TopocentricOrientation(Orientation):
     """Orientation for handling topocentric frames i.e. ground stations"""
 
@@ -129,11 +290,11 @@ class TopocentricOrientation(Orientation):
         self.latlonalt = latlonalt
         lat, lon = latlonalt[:-1]
 
-        # the 'rot3(np.pi)' is here to place the X axis along the north direction
-        self._m = rot3(-lon) @ rot2(lat - np.pi / 2.0) @ rot3(np.pi)
+        # Stations at the same location (e.g. antennas of the same site) share
+        # the same matrix
+        self._m = _topocentric_matrix(round(lat, 12), round(lon, 12))
 
-        mtd = f"{name}_to_{parent.name}"
-        setattr(self, mtd, self._to_parent)
+        self._add_transition(name, parent.name, self._to_parent)
 
         self.parent + self
 
@@ -159,8 +320,7 @@ class LocalOrbitalOrientation(Orientation):
         self.orient = orient
         self.parent = parent
 
-        mtd = f"{name}_to_{parent.orientation.name}"
-        setattr(Orientation, mtd, self._to_parent)
+        self._add_transition(name, parent.orientation.name, self._to_parent)
 
         self.parent.orientation + self
 
@@ -170,7 +330,10 @@ class LocalOrbitalOrientation(Orientation):
         else:
             sv = self.statevector
 
-        sv = sv.copy(form="cartesian", frame=self.parent)
+        # The conversion is skipped when the statevector is already in the
+        # right form and frame
+        if sv.form.name != "cartesian" or sv.frame is not self.parent:
+            sv = sv.copy(form="cartesian", frame=self.parent)
 
         return local.to_local(self.orient, sv, expanded=False).T, None
 
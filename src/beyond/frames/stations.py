@@ -1,16 +1,35 @@
+import math
 import numpy as np
 
 from . import frames, center, orient
 from ..constants import Earth
 
+_TWO_PI = 2 * np.pi
+
 
 class TopocentricFrame(frames.Frame):
     """Base class for ground station"""
 
     def __init__(self, name, orientation, center, mask=None):
-        self.mask = np.asarray(mask) if mask else None
+        self.mask = mask if mask else None
         super().__init__(name, orientation, center)
 
+    @property
+    def mask(self):
+        """Azimuth and elevation (2xN array) of the mask of the station, or None"""
+        return self._mask
+
+    @mask.setter
+    def mask(self, mask):
+        if mask is None:
+            self._mask = self._mask_az = self._mask_el = None
+        else:
+            self._mask = np.asarray(mask)
+            # Azimuths and elevations are kept as two contiguous arrays, as
+            # they are accessed separately by get_mask()
+            self._mask_az = np.ascontiguousarray(self._mask[0], dtype=float)
+            self._mask_el = np.ascontiguousarray(self._mask[1], dtype=float)
+
     @property
     def latlonalt(self):
         return self.orientation.latlonalt
@@ -78,43 +97,60 @@ class TopocentricFrame(frames.Frame):
         """Conversion from latitude, longitude and altitude coordinates to
         cartesian with respect to an ellipsoid
 
+        All arguments may also be arrays, in order to convert multiple points
+        at once.
+
         Args:
-            lat (float): Latitude in radians
-            lon (float): Longitude in radians
-            alt (float): Altitude to sea level in meters
+            lat (float or numpy.ndarray): Latitude in radians
+            lon (float or numpy.ndarray): Longitude in radians
+            alt (float or numpy.ndarray): Altitude to sea level in meters
 
         Return:
-            numpy.array: 3D element (in meters)
+            numpy.array: 3D element (in meters), with null velocity. If the
+            arguments are arrays of N elements, the shape is (N, 6).
         """
 
-        C = Earth.r / np.sqrt(1 - (Earth.e * np.sin(lat)) ** 2)
+        lat, lon, alt = np.broadcast_arrays(lat, lon, alt)
+
+        sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+
+        C = Earth.r / np.sqrt(1 - (Earth.e * sin_lat) ** 2)
         S = C * (1 - Earth.e**2)
 
-        x = (C + alt) * np.cos(lat) * np.cos(lon)
-        y = (C + alt) * np.cos(lat) * np.sin(lon)
-        z = (S + alt) * np.sin(lat)
+        out = np.zeros(lat.shape + (6,))
+        out[..., 0] = (C + alt) * cos_lat * np.cos(lon)
+        out[..., 1] = (C + alt) * cos_lat * np.sin(lon)
+        out[..., 2] = (S + alt) * sin_lat
 
-        return np.array([x, y, z, 0, 0, 0])
+        return out
 
     def get_mask(self, azim):
         """Linear interpolation between two points of the mask"""
 
-        if self.mask is None:
+        if self._mask is None:
             raise ValueError(f"No mask defined for the station {self.name}")
 
-        azim %= 2 * np.pi
+        # Scalar equivalent of 'azim % (2 * pi)', cheaper than its numpy counterpart
+        azim = math.fmod(azim, _TWO_PI)
+        if azim < 0:
+            azim += _TWO_PI
 
-        if azim in self.mask[0, :]:
-            return self.mask[1, np.where(azim == self.mask[0, :])[0][0]]
+        azims, elevs = self._mask_az, self._mask_el
 
-        for next_i, mask_azim in enumerate(self.mask[0, :]):
-            if mask_azim > azim:
-                break
-        else:
+        # On an exact match, the first occurrence of the azimuth is used, in
+        # case of a vertical step in the mask (i.e. a duplicated azimuth)
+        i = np.searchsorted(azims, azim, side="left")
+        if i < len(azims) and azims[i] == azim:
+            return elevs[i]
+
+        # Index of the first azimuth of the mask strictly greater than azim
+        next_i = np.searchsorted(azims, azim, side="right")
+
+        if next_i == len(azims):
             next_i = 0
 
-        x0, y0 = self.mask[:, next_i - 1]
-        x1, y1 = self.mask[:, next_i]
+        x0, y0 = azims[next_i - 1], elevs[next_i - 1]
+        x1, y1 = azims[next_i], elevs[next_i]
 
         if next_i - 1 == -1:
             x0 = 0
@@ -164,8 +200,6 @@ def create_station(
         o = orient.TopocentricOrientation(
             name, latlonalt, parent=parent_frame.orientation
         )
-        mtd = f"{name}_to_{parent_frame.orientation.name}"
-        setattr(orient.Orientation, mtd, o._to_parent)
         o + parent_frame.orientation
 
     return TopocentricFrame(name, o, c, mask=mask)
@@ -21,7 +21,7 @@ def load(fp):  # pragma: no cover
     OEM, MeasureSet if it's a TDM.
 
     Args:
-        fp: file descriptor of a CCSDS file
+        fp: file descriptor of a CCSDS file, opened in text or binary mode
     Return:
         Orbit, Ephem, List[Ephem] or MeasureSet
     Raise:
@@ -36,7 +36,8 @@ def loads(text):
     if it's a TDM.
 
     Args:
-        text (str):
+        text (str or bytes): content of the file. XML documents given as
+            bytes are handed as is to the XML parser, without decoding.
     Return:
         Orbit, Ephem, List[Ephem] or MeasureSet
     Raise:
@@ -45,6 +46,9 @@ def loads(text):
 
     type, fmt = detect2load(text)
 
+    if fmt == "kvn" and isinstance(text, bytes):
+        text = text.decode()
+
     if type == "oem":
         func = oem.loads
     elif type == "opm":
@@ -87,13 +91,21 @@ def dump(data, fp, **kwargs):  # pragma: no cover
         from beyond.config import config
         config["io"] = {"ccsds_default_format": "xml"}
     """
-    fp.write(dumps(data, **kwargs))
+
+    # Ephemerides can be large, and are written as they are generated
+    if detect2dump(data) == "oem":
+        oem.dump(data, fp, **kwargs)
+    else:
+        fp.write(dumps(data, **kwargs))
 
 
 def dumps(data, **kwargs):
     """Create a string CCSDS representation of the object
 
-    Same arguments and behaviour as :py:func:`dump`
+    Same arguments and behaviour as :py:func:`dump`, with the additional
+    keyword argument ``return_bytes`` allowing to retrieve the UTF-8
+    encoded content instead of a string. For XML outputs, this avoids
+    decoding the serialized document.
     """
 
     type = detect2dump(data)
@@ -109,4 +121,7 @@ def dumps(data, **kwargs):
     else:  # pragma: no cover
         raise CcsdsError(f"Unknown object type for CCSDS : {type}")
 
+    if kwargs.get("return_bytes") and isinstance(content, str):
+        content = content.encode()
+
     return content
@@ -1,8 +1,11 @@
 import re
+from io import BytesIO
 import numpy as np
 import lxml.etree as ET
 from collections import namedtuple
+from functools import lru_cache
 from collections.abc import Iterable
+from datetime import datetime, timedelta
 
 from ...utils import units
 from ...dates import Date
@@ -29,6 +32,9 @@ units_dict = {
     "km**3/s**2": units.km**3,
 }
 
+_units_inv = {k: 1.0 / v for k, v in units_dict.items()}
+"""Reciprocal of the unit factors, in order to replace divisions by multiplications"""
+
 
 Field = namedtuple("Field", "text attrib")
 DATE_FMT_DEFAULT = "%Y-%m-%dT%H:%M:%S.%f"
@@ -48,27 +54,61 @@ def get_format(**kwargs):
 def decode_unit(data, name, default=None):
     """Conversion of state vector field, with automatic unit handling"""
 
-    value = data[name].text
-    unit = data[name].attrib.get("units", default)
+    field = data[name]
+    unit = field.attrib.get("units", default)
 
-    if unit not in units_dict:
+    try:
+        factor = units_dict[unit]
+    except KeyError:
         raise CcsdsError(f"Unknown unit '{unit}' for the field {name}")
 
-    return float(value) * units_dict[unit]
+    return float(field.text) * factor
 
 
 def code_unit(data, name, unit):
     """Convert the value in SI to a specific unit"""
 
-    if unit not in units_dict:
+    try:
+        factor = _units_inv[unit]
+    except KeyError:
         raise CcsdsError(f"Unknown unit '{unit}' for the field {name}")
 
-    return data[name] / units_dict[unit]
+    return data[name] * factor
+
+
+_CALENDAR_DATE_RE = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?"
+)
+"""Calendar date format (YYYY-MM-DDThh:mm:ss[.ffffff]), as precompiled regular
+expression"""
+
+_DAY_OF_YEAR_RE = re.compile(r"(\d{4})-(\d{3})T(\d\d):(\d\d):(\d\d)\.(\d{1,6})")
+"""Day of year format (YYYY-DDDThh:mm:ss.ffffff), as precompiled regular
+expression"""
 
 
 def parse_date(string, scale):
     """Parse a date formated as described in the CCSDS Blue Books"""
 
+    # The most common format is handled directly, its fields having fixed
+    # positions, without going through the (much slower) generic strptime
+    m = _CALENDAR_DATE_RE.fullmatch(string)
+    if m:
+        *fields, fraction = m.groups()
+        microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+        return Date(datetime(*map(int, fields), microsecond), scale=scale)
+
+    # Same for the day of year format. Out of range days are left to strptime,
+    # for it to raise the error
+    m = _DAY_OF_YEAR_RE.fullmatch(string)
+    if m and 1 <= int(m.group(2)) <= 366:
+        year, day, *fields, fraction = m.groups()
+        microsecond = int(fraction.ljust(6, "0"))
+        dt = datetime(int(year), 1, 1, *map(int, fields), microsecond)
+        return Date(dt + timedelta(days=int(day) - 1), scale=scale)
+
+    # Less usual shapes (e.g. non-padded fields) are left to strptime, trying
+    # all the formats in turn
     try:
         out = Date.strptime(string, DATE_FMT_DEFAULT, scale=scale)
     except ValueError:
@@ -80,19 +120,66 @@ def parse_date(string, scale):
     return out
 
 
+@lru_cache(maxsize=32)
+def _center_frame_name(center):
+    """Name of the frame centered on a body other than the Earth, following
+    the naming convention of :py:mod:`beyond.env.jpl` dynamic frames
+    """
+    return center.title().replace(" ", "")
+
+
+def frame_name(frame, center):
+    """Convert the REF_FRAME and CENTER_NAME fields of a CCSDS message into
+    a beyond frame name
+
+    Args:
+        frame (str): REF_FRAME field
+        center (str): CENTER_NAME field
+    Return:
+        str
+    """
+    if center.lower() != "earth":
+        frame = _center_frame_name(center)
+    return frame
+
+
+def cached_parse_date():
+    """Provide a version of :py:func:`parse_date` caching its results
+
+    This is meant to be used during the loading of a single file, where
+    the same epoch is often found multiple times (e.g. state vector and
+    covariance of an OEM, or measurements of a TDM). The cache is not shared
+    between files, in order to not return dates computed with outdated
+    EOP data.
+    """
+    return lru_cache(maxsize=None)(parse_date)
+
+
+_TYPE_RE = re.compile(r"CCSDS_([A-Z]{3})_VERS", re.M)
+_TYPE_RE_BYTES = re.compile(rb"CCSDS_([A-Z]{3})_VERS", re.M)
+
+
 def detect2load(string):
     """Detect the type and format of the CCSDS file
 
     types may be : "OPM", "OMM", "OEM", "TDM"
     format may be: "kvn" or "xml"
-    """
 
-    format = "kvn" if string.lstrip().startswith("CCSDS_") else "xml"
+    Args:
+        string (str or bytes): content of the file
+    """
 
-    m = re.search(r"CCSDS_([A-Z]{3})_VERS", string, re.M)
+    if isinstance(string, bytes):
+        format = "kvn" if string.lstrip().startswith(b"CCSDS_") else "xml"
+        m = _TYPE_RE_BYTES.search(string)
+        ccsds_type = m and m.group(1).decode()
+    else:
+        format = "kvn" if string.lstrip().startswith("CCSDS_") else "xml"
+        m = _TYPE_RE.search(string)
+        ccsds_type = m and m.group(1)
 
-    if m and m.group(1) in ["OPM", "OMM", "OEM", "TDM"]:
-        type = m.group(1).lower()
+    if m and ccsds_type in ["OPM", "OMM", "OEM", "TDM"]:
+        type = ccsds_type.lower()
     elif m:
         raise CcsdsError(f"Unknown CCSDS type : {m}")
     else:
@@ -129,42 +216,114 @@ def detect2dump(data, **kwargs):
     return type
 
 
+XML_STREAM_THRESHOLD = 1024 * 1024
+"""Size (in bytes) above which XML documents are parsed incrementally"""
+
+
+def _xml_insert(data, tag, value):
+    """Insert a value in a dict, converting it into a list if the tag
+    is already present
+    """
+    if tag not in data:
+        data[tag] = value
+    elif not isinstance(data[tag], list):
+        # We encounter a new child, but a sibling with the same
+        # tag already exists
+        data[tag] = [data[tag], value]
+    else:
+        data[tag].append(value)
+
+
+def xml_bytes(string):
+    """Encoded content of an XML document, as expected by the parser
+
+    Args:
+        string (str or bytes): XML document, as text or already encoded
+    Return:
+        bytes
+    """
+    return string if isinstance(string, bytes) else string.encode()
+
+
 def xml2dict(string):
     """Convert and XML string into nested dicts
 
     The lowest element will be a Field object
+
+    Large documents (see :py:data:`XML_STREAM_THRESHOLD`) are parsed
+    incrementally, each element being discarded as soon as it is converted,
+    in order to not hold the whole XML tree in memory.
     """
 
+    if len(string) > XML_STREAM_THRESHOLD:
+        return _xml2dict_stream(string)
+
     root = ET.fromstring(string)
 
     def _recurse(elem):
         data = {}
         for subelem in elem:
             if hasattr(subelem, "text") and subelem.text.strip():
-                field = Field(subelem.text, subelem.attrib)
-                if subelem.tag not in data:
-                    data[subelem.tag] = field
-                elif not isinstance(data[subelem.tag], list):
-                    data[subelem.tag] = [data[subelem.tag], field]
-                else:
-                    data[subelem.tag].append(field)
-            elif subelem.tag in data:
-                if not isinstance(data[subelem.tag], list):
-                    # We encounter a new child, but a sibling with the same
-                    # tag already exists
-                    data[subelem.tag] = [data[subelem.tag], _recurse(subelem)]
-                else:
-                    data[subelem.tag].append(_recurse(subelem))
+                _xml_insert(data, subelem.tag, Field(subelem.text, subelem.attrib))
             else:
-                data[subelem.tag] = _recurse(subelem)
+                _xml_insert(data, subelem.tag, _recurse(subelem))
         return data
 
     return _recurse(root)
 
 
+def _xml2dict_stream(string):
+    """Incremental version of :py:func:`xml2dict`"""
+
+    # Stack of the dicts of the elements currently opened
+    stack = [{}]
+    for event, elem in ET.iterparse(BytesIO(string), events=("start", "end")):
+        if event == "start":
+            stack.append({})
+            continue
+
+        children = stack.pop()
+        if children or not (elem.text and elem.text.strip()):
+            value = children
+        else:
+            # The attributes are copied, as the element is cleared afterward
+            value = Field(elem.text, dict(elem.attrib))
+
+        _xml_insert(stack[-1], elem.tag, value)
+        elem.clear()
+
+    # The top-level dict only contains the root element
+    (root,) = stack[0].values()
+    return root
+
+
+def xml2fields(elem):
+    """Convert the children of an XML element into a dict of Field objects
+
+    Contrary to :py:func:`xml2dict`, this function is not recursive, and
+    children sharing the same tag (e.g. comments) are not gathered in lists.
+    """
+    return {
+        child.tag: Field(child.text, dict(child.attrib))
+        for child in elem
+        if isinstance(child.tag, str)
+    }
+
+
+_KVN_RE = re.compile(
+    r"^(?:(COMMENT.*)|([^=\n]*)(?:=([^\[\n]*)(?:\[([^\]\n]*))?)?).*$", re.M
+)
+"""Regular expression splitting each line of a KVN file into comment, key, value
+and unit"""
+
+
 def kvn2dict(string):
     """Convert KVN (Key-Value Notation) to a dictionnary for easy reuse
 
+    Maneuvers and user-defined parameters are gathered during the same pass,
+    respectively as a list of dicts under the ``maneuvers`` key, and as a dict
+    of texts under the ``user_defined`` key.
+
     Args:
         string (str)
     Return:
@@ -173,24 +332,16 @@ def kvn2dict(string):
 
     data = {}
     comments = {}
-    for i, line in enumerate(string.splitlines()):
-        if not line:
-            continue
-        if line.startswith("COMMENT"):
-            comments[i] = line.split("COMMENT")[-1].strip()
+    for i, (comment, key, value, unit) in enumerate(_KVN_RE.findall(string)):
+        if comment:
+            comments[i] = comment[7:].strip()
             continue
 
-        key, _, value = line.partition("=")
-
         key = key.strip()
-        value = value.strip()
+        if not key:
+            continue
 
-        if "[" in value:
-            # There is a unit field
-            value, sep, unit = value.partition("[")
-            attrib = {"units": unit.rstrip("]")}
-        else:
-            attrib = {}
+        field = Field(value.strip(), {"units": unit} if unit else {})
 
         if key.startswith("MAN_"):
             if key == "MAN_EPOCH_IGNITION":
@@ -198,9 +349,11 @@ def kvn2dict(string):
                 data.setdefault("maneuvers", []).append(man)
                 if i - 1 in comments:
                     man["COMMENT"] = Field(comments[i - 1], {})
-            man[key] = Field(value, attrib)
+            man[key] = field
+        elif key.startswith("USER_DEFINED"):
+            data.setdefault("user_defined", {})[key[13:]] = field.text
         else:
-            data[key] = Field(value, attrib)
+            data[key] = field
 
     return data
 
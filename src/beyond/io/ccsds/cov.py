@@ -1,7 +1,17 @@
 import numpy as np
+import lxml.etree as ET
 
 from ...orbits.cov import Cov
 
+ELEMS = ["X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT"]
+
+_TRIL = np.tril_indices(len(ELEMS))
+"""Indices of the lower triangular part of a covariance matrix, row by row"""
+
+_COV_KEYS = tuple(f"C{ELEMS[i]}_{ELEMS[j]}" for i, j in zip(*_TRIL))
+"""Names of the terms of the lower triangular part of a covariance matrix,
+in the same order as :py:data:`_TRIL`"""
+
 
 def load_cov(orb, data):
     if "COV_REF_FRAME" in data:
@@ -12,75 +22,52 @@ def load_cov(orb, data):
     if frame in ("RSW", "RTN"):
         frame = "QSW"
 
-    values = [
-        [
-            data["CX_X"].text,
-            data["CY_X"].text,
-            data["CZ_X"].text,
-            data["CX_DOT_X"].text,
-            data["CY_DOT_X"].text,
-            data["CZ_DOT_X"].text,
-        ],
-        [
-            data["CY_X"].text,
-            data["CY_Y"].text,
-            data["CZ_Y"].text,
-            data["CX_DOT_Y"].text,
-            data["CY_DOT_Y"].text,
-            data["CZ_DOT_Y"].text,
-        ],
-        [
-            data["CZ_X"].text,
-            data["CZ_Y"].text,
-            data["CZ_Z"].text,
-            data["CX_DOT_Z"].text,
-            data["CY_DOT_Z"].text,
-            data["CZ_DOT_Z"].text,
-        ],
-        [
-            data["CX_DOT_X"].text,
-            data["CX_DOT_Y"].text,
-            data["CX_DOT_Z"].text,
-            data["CX_DOT_X_DOT"].text,
-            data["CY_DOT_X_DOT"].text,
-            data["CZ_DOT_X_DOT"].text,
-        ],
-        [
-            data["CY_DOT_X"].text,
-            data["CY_DOT_Y"].text,
-            data["CY_DOT_Z"].text,
-            data["CY_DOT_X_DOT"].text,
-            data["CY_DOT_Y_DOT"].text,
-            data["CZ_DOT_Y_DOT"].text,
-        ],
-        [
-            data["CZ_DOT_X"].text,
-            data["CZ_DOT_Y"].text,
-            data["CZ_DOT_Z"].text,
-            data["CZ_DOT_X_DOT"].text,
-            data["CZ_DOT_Y_DOT"].text,
-            data["CZ_DOT_Z_DOT"].text,
-        ],
-    ]
-
-    cov = Cov(orb, np.array(values).astype(np.float64) * 1e6, frame)
+    # Only the lower triangular part is given, the matrix being symmetric
+    lower = [float(data[k].text) for k in _COV_KEYS]
+    values = np.empty((6, 6))
+    values[_TRIL] = lower
+    values[_TRIL[::-1]] = lower
+
+    values *= 1e6
+    cov = Cov(orb, values, frame)
 
     return cov
 
 
 def dump_cov(cov):
-    text = "\n"
-    if cov.frame != cov.orb.frame:
-        frame = cov.frame
+    lines = [""]
+    frame = cov.frame
+    if frame != cov.orb.frame:
+        if frame == "QSW":
+            frame = "RSW"
+        lines.append(f"COV_REF_FRAME        = {frame}")
+
+    # Conversion from m to km, for the whole matrix at once
+    values = (np.asarray(cov) / 1000000.0)[_TRIL].tolist()
+
+    lines.extend(f"{k:<20} = {v: 0.12e}" for k, v in zip(_COV_KEYS, values))
+
+    return "\n".join(lines) + "\n"
+
+
+def dump_xml_cov(elem, cov):
+    """Fill a covarianceMatrix XML element
+
+    Args:
+        elem (lxml.etree.Element): element to populate
+        cov (Cov): covariance matrix to dump
+    """
+    frame = cov.frame
+    if frame != cov.orb.frame:
         if frame == "QSW":
             frame = "RSW"
-        text += f"COV_REF_FRAME        = {frame}\n"
 
-    elems = ["X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT"]
-    for i, a in enumerate(elems):
-        for j, b in enumerate(elems[: i + 1]):
-            txt = f"{a}_{b}"
+        cov_frame = ET.SubElement(elem, "COV_REF_FRAME")
+        cov_frame.text = f"{frame}"
 
-            text += f"C{txt:<19} = {cov[i, j] / 1000000.0: 0.12e}\n"
+    # Conversion from m to km, for the whole matrix at once
+    values = (np.asarray(cov) / 1000000.0)[_TRIL].tolist()
 
-    return text
+    for k, v in zip(_COV_KEYS, values):
+        x = ET.SubElement(elem, k)
+        x.text = f"{v:0.12e}"
@@ -1,23 +1,31 @@
+from io import BytesIO, StringIO
+from collections import namedtuple
+from itertools import chain
+
 import numpy as np
 import lxml.etree as ET
 
 from ...utils import units
 from ...orbits import Ephem, StateVector
+from ...orbits.forms import get_form, CART
+from ...frames.frames import get_frame
 
 from .commons import (
-    parse_date,
+    cached_parse_date,
+    frame_name,
     CcsdsError,
     dump_kvn_header,
     dump_kvn_meta_odm,
     dump_xml_header,
     dump_xml_meta_odm,
     DATE_FMT_DEFAULT,
-    xml2dict,
-    decode_unit,
+    xml2fields,
+    xml_bytes,
+    units_dict,
     Field,
     get_format,
 )
-from .cov import load_cov
+from .cov import load_cov, dump_xml_cov, _COV_KEYS
 
 
 def loads(string, fmt):
@@ -38,7 +46,50 @@ def loads(string, fmt):
     return ephem
 
 
-def dumps(data, **kwargs):
+_WRITE_BUFFER_SIZE = 64 * 1024
+"""Approximate size (in characters) of the chunks written by :py:func:`dump`"""
+
+
+def dump(data, fp, **kwargs):
+    """Write an OEM into a file
+
+    In KVN format, the text is written by chunks as it is generated, in order
+    to never hold the whole file in memory.
+
+    Args:
+        data (Ephem or List[Ephem]): object to dump
+        fp (file descriptor): text stream to write into
+    """
+    fmt = get_format(**kwargs)
+
+    if fmt != "kvn":
+        fp.write(dumps(data, **kwargs))
+        return
+
+    if isinstance(data, Ephem):
+        data = [data]
+
+    buf = []
+    size = 0
+    for chunk in _iter_kvn(data, **kwargs):
+        buf.append(chunk)
+        size += len(chunk)
+        if size >= _WRITE_BUFFER_SIZE:
+            fp.write("".join(buf))
+            buf.clear()
+            size = 0
+
+    fp.write("".join(buf))
+
+
+def dumps(data, return_bytes=False, **kwargs):
+    """
+    Args:
+        data (Ephem or List[Ephem]): object to dump
+        return_bytes (bool): If ``True``, provide the UTF-8 encoded content
+    Return:
+        str or bytes:
+    """
     fmt = get_format(**kwargs)
 
     if isinstance(data, Ephem):
@@ -46,8 +97,13 @@ def dumps(data, **kwargs):
 
     if fmt == "kvn":
         string = _dumps_kvn(data, **kwargs)
+        if return_bytes:
+            string = string.encode()
     elif fmt == "xml":
         string = _dumps_xml(data, **kwargs)
+        # The XML is serialized as bytes, and only decoded if needed
+        if not return_bytes:
+            string = string.decode()
     else:  # pragma: no cover
         raise CcsdsError(f"Unknown format '{fmt}'")
 
@@ -55,96 +111,84 @@ def dumps(data, **kwargs):
 
 
 def _loads_kvn(string):
+    """
+    Args:
+        string (str or file-like): Text of the OEM, or text stream to read
+            it from
+    Return:
+        Ephem or List[Ephem]
+    """
     ephems = []
-    required = ("REF_FRAME", "CENTER_NAME", "TIME_SYSTEM", "OBJECT_ID", "OBJECT_NAME")
+
+    parse_date = cached_parse_date()
+
+    # Lines are read one at a time, instead of building the list of all
+    # the lines of the file beforehand
+    if not hasattr(string, "read"):
+        string = StringIO(string, newline=None)
 
     mode = None
-    for line in string.splitlines():
-        if not line or line.startswith("COMMENT"):  # pragma: no cover
+    for line in string:
+        line = line.rstrip("\r\n")
+        # Data lines are by far the most common, and always start with the
+        # epoch, so they are identified before any other kind of line.
+        # The lines are only stored here, and converted all at once
+        # at the end of the data block
+        if mode == "data" and line[:1].isdigit():
+            ephem["data_lines"].append(line)
             continue
-        elif line.startswith("META_START"):
+
+        if not line:
+            continue
+
+        # As for the TDM, checking the first character avoids most of the
+        # calls to startswith() for metadata and covariance lines
+        first = line[0]
+        if first == "C" and line.startswith("COMMENT"):
+            continue
+        elif first == "M" and line.startswith("META_START"):
+            if mode == "data":
+                _parse_kvn_data(ephem, parse_date)
             mode = "meta"
-            ephem = {"orbits": [], "orbit_mapping": {}}
+            ephem = {"fields": {}, "orbits": [], "orbit_mapping": {}, "data_lines": []}
             ephems.append(ephem)
-        elif line.startswith("META_STOP"):
+        elif first == "M" and line.startswith("META_STOP"):
             mode = "data"
-
-            # Check for required fields
-            for k in required:
-                if k not in ephem:
-                    raise CcsdsError(f"Missing mandatory parameter '{k}'")
-
-            # Conversion to be compliant with beyond.env.jpl dynamic reference
-            # frames naming convention.
-            if ephem["CENTER_NAME"].lower() != "earth":
-                ephem["REF_FRAME"] = ephem["CENTER_NAME"].title().replace(" ", "")
+            ephem["meta"] = _parse_metadata(ephem.pop("fields"))
         elif line == "COVARIANCE_START":
+            if mode == "data":
+                _parse_kvn_data(ephem, parse_date)
             mode = "covariance"
             ephem["dangling_covariance"] = []
         elif line == "COVARIANCE_STOP":
             mode = None
         elif mode == "meta":
             key, _, value = line.partition("=")
-            ephem[key.strip()] = value.strip()
-        elif mode == "data":
-            date, *state_vector = line.split()
-            date = parse_date(date, ephem["TIME_SYSTEM"])
-
-            # Conversion from km to m, from km/s to m/s
-            # and discard acceleration if present
-            state_vector = np.array([float(x) for x in state_vector[:6]]) * units.km
-
-            orb = StateVector(
-                state_vector,
-                date,
-                "cartesian",
-                ephem["REF_FRAME"],
-                name=ephem["OBJECT_NAME"],
-                cospar_id=ephem["OBJECT_ID"],
-            )
-            ephem["orbits"].append(orb)
-            ephem["orbit_mapping"][date] = orb
+            ephem["fields"][key.strip()] = value.strip()
+        elif mode == "data":  # pragma: no cover
+            # Data lines not caught above (e.g. indented ones)
+            ephem["data_lines"].append(line)
         elif mode == "covariance":
-            if line.startswith("EPOCH"):
-                cov = {
-                    "EPOCH": parse_date(
-                        line.partition("=")[2].strip(), ephem["TIME_SYSTEM"]
-                    )
-                }
-            elif line.startswith("COV_REF_FRAME"):
-                cov["COV_REF_FRAME"] = Field(line.partition("=")[2].strip(), {})
+            # The keyword is extracted once, and compared to the few
+            # possible ones. Lines without keyword are rows of the matrix
+            key, _, value = line.partition("=")
+            key = key.strip()
+            if key == "EPOCH":
+                cov = {"EPOCH": parse_date(value.strip(), ephem["meta"].scale)}
+            elif key == "COV_REF_FRAME":
+                cov["COV_REF_FRAME"] = Field(value.strip(), {})
             else:
                 values = line.split()
-                if len(values) > 6:  # pragma: no cover
+                row = len(values)
+                if row > 6:  # pragma: no cover
                     raise CcsdsError("Unknown covariance field lenght")
-                elif len(values) == 1:
-                    cov["CX_X"] = Field(values[0], {})
-                elif len(values) == 2:
-                    cov["CY_X"] = Field(values[0], {})
-                    cov["CY_Y"] = Field(values[1], {})
-                elif len(values) == 3:
-                    cov["CZ_X"] = Field(values[0], {})
-                    cov["CZ_Y"] = Field(values[1], {})
-                    cov["CZ_Z"] = Field(values[2], {})
-                elif len(values) == 4:
-                    cov["CX_DOT_X"] = Field(values[0], {})
-                    cov["CX_DOT_Y"] = Field(values[1], {})
-                    cov["CX_DOT_Z"] = Field(values[2], {})
-                    cov["CX_DOT_X_DOT"] = Field(values[3], {})
-                elif len(values) == 5:
-                    cov["CY_DOT_X"] = Field(values[0], {})
-                    cov["CY_DOT_Y"] = Field(values[1], {})
-                    cov["CY_DOT_Z"] = Field(values[2], {})
-                    cov["CY_DOT_X_DOT"] = Field(values[3], {})
-                    cov["CY_DOT_Y_DOT"] = Field(values[4], {})
-                elif len(values) == 6:
-                    cov["CZ_DOT_X"] = Field(values[0], {})
-                    cov["CZ_DOT_Y"] = Field(values[1], {})
-                    cov["CZ_DOT_Z"] = Field(values[2], {})
-                    cov["CZ_DOT_X_DOT"] = Field(values[3], {})
-                    cov["CZ_DOT_Y_DOT"] = Field(values[4], {})
-                    cov["CZ_DOT_Z_DOT"] = Field(values[5], {})
 
+                # The n-th row of the lower triangular part holds n terms
+                start = row * (row - 1) // 2
+                for k, v in zip(_COV_KEYS[start : start + row], values):
+                    cov[k] = Field(v, {})
+
+                if row == 6:
                     if cov["EPOCH"] in ephem["orbit_mapping"]:
                         orb = ephem["orbit_mapping"][cov["EPOCH"]]
                         cov_obj = load_cov(orb, cov)
@@ -153,19 +197,12 @@ def _loads_kvn(string):
                         raise CcsdsError(
                             "Impossible to attach a covariance matrix to an orbit object"
                         )
-                else:  # pragma: no cover
-                    continue
 
-    for i, ephem_dict in enumerate(ephems):
-        # In case there is no recommendation for interpolation
-        # default to a Lagrange 8th order
-        method = ephem_dict.get("INTERPOLATION", "Lagrange").lower()
-        order = int(ephem_dict.get("INTERPOLATION_DEGREE", 8))
-        ephem = Ephem(ephem_dict["orbits"], method=method, order=order)
+    if mode == "data":
+        _parse_kvn_data(ephem, parse_date)
 
-        ephem.name = ephem_dict["OBJECT_NAME"]
-        ephem.cospar_id = ephem_dict["OBJECT_ID"]
-        ephems[i] = ephem
+    for i, ephem_dict in enumerate(ephems):
+        ephems[i] = _build_ephem(ephem_dict["orbits"], ephem_dict["meta"])
 
     if len(ephems) == 1:
         return ephems[0]
@@ -173,65 +210,196 @@ def _loads_kvn(string):
     return ephems
 
 
+def _parse_kvn_data(ephem, parse_date):
+    """Conversion of the data lines of an OEM segment into StateVector objects
+
+    The position and velocity of all the lines are parsed in a single pass,
+    once each line has been checked.
+
+    Args:
+        ephem (dict): Segment being parsed
+        parse_date (Callable): function used to parse the epochs
+    Raise:
+        CcsdsError: if a line does not hold 6 or 9 numerical values after
+            its epoch
+    """
+
+    lines = ephem.pop("data_lines")
+    if not lines:  # pragma: no cover
+        return
+
+    rows = [line.split() for line in lines]
+    for line, row in zip(lines, rows):
+        # Epoch, position, velocity and optionally acceleration
+        if len(row) not in (7, 10):
+            raise CcsdsError(f"Invalid number of values in state vector '{line}'")
+
+    # The acceleration, if present, is discarded
+    try:
+        values = np.fromstring(
+            " ".join(chain.from_iterable(row[1:7] for row in rows)), sep=" "
+        )
+    except ValueError:
+        values = None
+
+    if values is None or values.size != 6 * len(rows):
+        # Look for the faulty line, in order to report it
+        for line, row in zip(lines, rows):
+            try:
+                list(map(float, row[1:7]))
+            except ValueError:
+                raise CcsdsError(f"Invalid value in state vector '{line}'")
+        raise CcsdsError("Invalid values in state vectors")  # pragma: no cover
+
+    # Conversion from km to m, from km/s to m/s. The conversion is done
+    # in place, the parsed array being a temporary one.
+    values = values.reshape(len(rows), 6)
+    values *= units.km
+
+    _add_orbits(ephem, [row[0] for row in rows], values, parse_date)
+
+
+_Metadata = namedtuple("_Metadata", "name cospar_id frame scale method order")
+"""Metadata of an OEM segment, once checked and converted"""
+
+_REQUIRED = ("REF_FRAME", "CENTER_NAME", "TIME_SYSTEM", "OBJECT_ID", "OBJECT_NAME")
+"""Mandatory fields of the metadata of an OEM segment"""
+
+
+def _parse_metadata(fields):
+    """Check and convert the metadata of an OEM segment
+
+    This is shared by the KVN and XML parsers, and done once per segment.
+
+    Args:
+        fields (dict): text of each field of the metadata
+    Return:
+        _Metadata
+    Raise:
+        CcsdsError: if a mandatory field is missing
+    """
+
+    for k in _REQUIRED:
+        if k not in fields:
+            raise CcsdsError(f"Missing mandatory parameter '{k}'")
+
+    # In case there is no recommendation for interpolation
+    # default to a Lagrange 8th order
+    return _Metadata(
+        name=fields["OBJECT_NAME"],
+        cospar_id=fields["OBJECT_ID"],
+        frame=frame_name(fields["REF_FRAME"], fields["CENTER_NAME"]),
+        scale=fields["TIME_SYSTEM"],
+        method=fields.get("INTERPOLATION", "Lagrange").lower(),
+        order=int(fields.get("INTERPOLATION_DEGREE", 8)),
+    )
+
+
+def _build_ephem(orbits, meta):
+    """Create the Ephem object of an OEM segment
+
+    Args:
+        orbits (List[StateVector]): state vectors of the segment
+        meta (_Metadata): metadata of the segment
+    Return:
+        Ephem
+    """
+    ephem = Ephem(orbits, method=meta.method, order=meta.order)
+    ephem.name = meta.name
+    ephem.cospar_id = meta.cospar_id
+    return ephem
+
+
+def _add_orbits(segment, dates, values, parse_date):
+    """Create the StateVector objects of an OEM segment
+
+    The form and frame being shared by all the state vectors of the segment,
+    they are resolved only once, instead of once per state vector. The
+    StateVector objects are built in a single list, then added to the
+    segment at once.
+
+    Args:
+        segment (dict): Segment being parsed, with its metadata
+        dates (List[str]): epochs of the state vectors
+        values (numpy.ndarray): Nx6 array of state vectors, in SI units
+        parse_date (Callable): function used to parse the epochs
+    """
+
+    meta = segment["meta"]
+    form = get_form("cartesian")
+    frame = get_frame(meta.frame)
+
+    dates = [parse_date(date, meta.scale) for date in dates]
+    orbits = [
+        StateVector(sv, date, form, frame, name=meta.name, cospar_id=meta.cospar_id)
+        for date, sv in zip(dates, values)
+    ]
+
+    segment["orbits"].extend(orbits)
+    segment["orbit_mapping"].update(zip(dates, orbits))
+
+
+_XML_COORDS = (
+    ("X", "km"),
+    ("Y", "km"),
+    ("Z", "km"),
+    ("X_DOT", "km/s"),
+    ("Y_DOT", "km/s"),
+    ("Z_DOT", "km/s"),
+)
+"""Fields of an OEM XML state vector, and their default units"""
+
+
 def _loads_xml(string):
-    data = xml2dict(string.encode())
+    parse_date = cached_parse_date()
 
     ephems = []
 
-    segments = data["body"]["segment"]
-    if isinstance(segments, dict):
-        segments = [segments]
-
+    # The document is parsed incrementally, each element being discarded once
+    # converted, in order to not hold the whole XML tree in memory
+    tags = ("metadata", "stateVector", "covarianceMatrix", "segment")
     try:
-        for segment in segments:
-            metadata = segment["metadata"]
-            data_tag = segment["data"]
-
-            ref_frame = metadata["REF_FRAME"].text
-            if metadata["CENTER_NAME"].text.lower() != "earth":
-                ref_frame = metadata["CENTER_NAME"].text.title().replace(" ", "")
-
-            ephem = []
-            orbit_mapping = {}
-            for statevector in data_tag["stateVector"]:
-                orb = StateVector(
-                    [
-                        decode_unit(statevector, "X", "km"),
-                        decode_unit(statevector, "Y", "km"),
-                        decode_unit(statevector, "Z", "km"),
-                        decode_unit(statevector, "X_DOT", "km/s"),
-                        decode_unit(statevector, "Y_DOT", "km/s"),
-                        decode_unit(statevector, "Z_DOT", "km/s"),
-                    ],
-                    parse_date(statevector["EPOCH"].text, metadata["TIME_SYSTEM"].text),
-                    "cartesian",
-                    ref_frame,
-                    name=metadata["OBJECT_NAME"].text,
-                    cospar_id=metadata["OBJECT_ID"].text,
+        for _, elem in ET.iterparse(BytesIO(xml_bytes(string)), tag=tags):
+            if elem.tag == "metadata":
+                fields = {k: v.text for k, v in xml2fields(elem).items()}
+                segment = {
+                    "meta": _parse_metadata(fields),
+                    "orbits": [],
+                    "orbit_mapping": {},
+                    "epochs": [],
+                    "values": [],
+                    "units": [],
+                }
+            elif elem.tag == "stateVector":
+                # The values are only stored here, and converted all at once
+                # at the end of the state vectors of the segment
+                statevector = xml2fields(elem)
+                segment["epochs"].append(statevector["EPOCH"].text)
+                segment["values"].append([statevector[k].text for k, _ in _XML_COORDS])
+                segment["units"].append(
+                    tuple(statevector[k].attrib.get("units", u) for k, u in _XML_COORDS)
                 )
-                ephem.append(orb)
-                orbit_mapping[orb.date] = orb
+            elif elem.tag == "covarianceMatrix":
+                _parse_xml_data(segment, parse_date)
 
-            for cov in data_tag.get("covarianceMatrix", []):
-                date = parse_date(cov["EPOCH"].text, metadata["TIME_SYSTEM"].text)
-                if date in orbit_mapping:
-                    orb = orbit_mapping[date]
+                cov = xml2fields(elem)
+                date = parse_date(cov["EPOCH"].text, segment["meta"].scale)
+                if date in segment["orbit_mapping"]:
+                    orb = segment["orbit_mapping"][date]
                     orb.cov = load_cov(orb, cov)
                 else:  # pragma: no cover
                     raise CcsdsError(
                         "Impossible to attach a covariance matrix to an orbit object"
                     )
+            else:
+                # End of the segment
+                _parse_xml_data(segment, parse_date)
 
-            ephem = Ephem(
-                ephem,
-                method=metadata.get(
-                    "INTERPOLATION", Field("Lagrange", {})
-                ).text.lower(),
-                order=int(metadata.get("INTERPOLATION_DEGREE", Field("8", {})).text),
-            )
-            ephem.name = metadata["OBJECT_NAME"].text
-            ephem.cospar_id = metadata["OBJECT_ID"].text
-            ephems.append(ephem)
+                ephems.append(_build_ephem(segment["orbits"], segment["meta"]))
+
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
     except KeyError as e:
         raise CcsdsError(f"Missing mandatory parameter {e}")
 
@@ -241,11 +409,91 @@ def _loads_xml(string):
     return ephems
 
 
+def _parse_xml_data(segment, parse_date):
+    """Conversion of the state vectors of an OEM XML segment into StateVector
+    objects
+
+    The numerical values of all the state vectors are converted in a single
+    pass.
+
+    Args:
+        segment (dict): Segment being parsed
+        parse_date (Callable): function used to parse the epochs
+    """
+
+    if not segment["epochs"]:
+        return
+
+    values = np.array(segment["values"], dtype=float)
+
+    # In most cases, all the state vectors share the same units
+    factors = {}
+    for unit_set in set(segment["units"]):
+        for (name, _), unit in zip(_XML_COORDS, unit_set):
+            if unit not in units_dict:
+                raise CcsdsError(f"Unknown unit '{unit}' for the field {name}")
+        factors[unit_set] = [units_dict[unit] for unit in unit_set]
+
+    if len(factors) == 1:
+        (factors,) = factors.values()
+    else:  # pragma: no cover
+        factors = [factors[unit_set] for unit_set in segment["units"]]
+
+    values *= factors
+
+    _add_orbits(segment, segment["epochs"], values, parse_date)
+
+    segment["epochs"].clear()
+    segment["values"].clear()
+    segment["units"].clear()
+
+
+def _stack_km(ephem):
+    """Positions and velocities of all the state vectors of an ephemeris
+
+    State vectors in any other form than cartesian are converted, without
+    modifying the ephemeris.
+
+    Args:
+        ephem (Ephem):
+    Return:
+        numpy.ndarray: Nx6 array, in km and km/s
+    """
+
+    values = np.array(
+        [
+            orb.base if orb.form is CART else orb.copy(form=CART).base
+            for orb in ephem
+        ]
+    )
+    # In place conversion, in order to not allocate a second array
+    values /= units.km
+    return values
+
+
+_KVN_STATEVECTOR_FMT = "%s " + " ".join(["% 10f"] * 6)
+"""Format of a state vector line (date, position and velocity) in an OEM KVN file"""
+
+
 def _dumps_kvn(data, **kwargs):
-    header = dump_kvn_header(data, "OEM", version="2.0", **kwargs)
+    return "".join(_iter_kvn(data, **kwargs))
+
+
+def _iter_kvn(data, **kwargs):
+    """Generate the text of an OEM in KVN format, chunk by chunk
+
+    Args:
+        data (List[Ephem]): Ephems to dump, one per segment
+    Yield:
+        str: consecutive chunks of text
+    """
+
+    yield dump_kvn_header(data, "OEM", version="2.0", **kwargs) + "\n"
 
-    content = []
     for i, data in enumerate(data):
+        if i:
+            yield "\n\n\n"
+
         data.form = "cartesian"
 
         extras = {
@@ -256,20 +504,23 @@ def _dumps_kvn(data, **kwargs):
         if data.method != data.LINEAR:
             extras["INTERPOLATION_DEGREE"] = str(data.order)
 
-        meta = dump_kvn_meta_odm(data, extras=extras, **kwargs)
+        yield dump_kvn_meta_odm(data, extras=extras, **kwargs)
+
+        values = _stack_km(data)
 
-        text = []
+        # Local aliases, for the loop below to not look them up at each line
+        sv_fmt, date_fmt = _KVN_STATEVECTOR_FMT, DATE_FMT_DEFAULT
+
+        # Each state vector line is yielded as soon as it is formatted,
+        # separated from the previous one by a newline
         cov = []
-        for orb in data:
-            text.append(
-                "{date:{dfmt}} {orb}".format(
-                    date=orb.date,
-                    orb=" ".join(f"{x: 10f}" for x in orb.base / units.km),
-                    dfmt=DATE_FMT_DEFAULT,
-                )
-            )
+        sep = ""
+        for orb, state_vector in zip(data, values.tolist()):
+            yield sep + sv_fmt % (orb.date.strftime(date_fmt), *state_vector)
+            sep = "\n"
 
-            if orb.cov is not None:
+            orb_cov = orb.cov
+            if orb_cov is not None:
                 cov_text = []
 
                 if cov:
@@ -279,89 +530,125 @@ def _dumps_kvn(data, **kwargs):
                     "EPOCH = {date:{dfmt}}".format(date=orb.date, dfmt=DATE_FMT_DEFAULT)
                 )
 
-                if orb.cov.frame != orb.frame:
-                    frame = orb.cov.frame
+                frame = orb_cov.frame
+                if frame != orb.frame:
                     if frame == "QSW":
                         frame = "RSW"
                     cov_text.append(f"COV_REF_FRAME = {frame}")
 
+                cov_values = np.asarray(orb_cov) / 1000000.0
                 for i in range(6):
-                    line = []
-                    for j in range(i + 1):
-                        line.append(f"{orb.cov[i, j] / 1000000.0: 0.12e}")
-                    cov_text.append(" ".join(line))
+                    cov_text.append(
+                        " ".join(f"{x: 0.12e}" for x in cov_values[i, : i + 1])
+                    )
 
                 cov.append("\n".join(cov_text))
 
         if cov:
             cov.insert(0, "\n\nCOVARIANCE_START")
             cov.append("COVARIANCE_STOP\n")
+            yield "\n".join(cov)
 
-        content.append(meta + "\n".join(text) + "\n".join(cov))
 
-    return header + "\n" + "\n\n\n".join(content)
+_XML_STATEVECTOR_PREFIX = "\n" + "  " * 4
+_XML_STATEVECTOR_INDENT = ("\n" + "  " * 5, _XML_STATEVECTOR_PREFIX)
+"""Indentation of the stateVector elements of a pretty-printed OEM (before
+the element, then inside it before its children and before its closing tag),
+precomputed as those are the bulk of the document"""
 
 
-def _dumps_xml(data, **kwargs):
-    top = dump_xml_header(data, "OEM", version="2.0", **kwargs)
-    body = ET.SubElement(top, "body")
+def _xml_write(xf, elem, level):
+    """Write an element in an incremental XML file, indented as it would be
+    in a pretty-printed document
+    """
+    ET.indent(elem, level=level)
+    xf.write("\n" + "  " * level, elem)
 
-    for i, data in enumerate(data):
-        segment = ET.SubElement(body, "segment")
 
-        extras = {
-            "START_TIME": data.start.strftime(DATE_FMT_DEFAULT),
-            "STOP_TIME": data.stop.strftime(DATE_FMT_DEFAULT),
-            "INTERPOLATION": data.method.upper(),
-        }
-        if data.method != data.LINEAR:
-            extras["INTERPOLATION_DEGREE"] = str(data.order)
-
-        dump_xml_meta_odm(segment, data, extras=extras, **kwargs)
+def _dumps_xml(data, **kwargs):
+    # The header and metadata are built by the common helpers, but the
+    # document itself is written incrementally, each state vector being
+    # serialized as soon as it is created, instead of building the whole
+    # tree in memory before serializing it.
+    top = dump_xml_header(data, "OEM", version="2.0", **kwargs)
 
-        data_tag = ET.SubElement(segment, "data")
+    buf = BytesIO()
+    with ET.xmlfile(buf, encoding="UTF-8") as xf:
+        xf.write_declaration()
+        with xf.element(top.tag, top.attrib, nsmap=top.nsmap):
+            # The children are moved to a detached element, for the
+            # namespace declaration of the root not to be repeated on it
+            header = ET.Element("header")
+            header.extend(top.find("header"))
+            _xml_write(xf, header, 1)
+            xf.write("\n  ")
+            with xf.element("body"):
+                for data in data:
+                    xf.write("\n    ")
+                    with xf.element("segment"):
+                        extras = {
+                            "START_TIME": data.start.strftime(DATE_FMT_DEFAULT),
+                            "STOP_TIME": data.stop.strftime(DATE_FMT_DEFAULT),
+                            "INTERPOLATION": data.method.upper(),
+                        }
+                        if data.method != data.LINEAR:
+                            extras["INTERPOLATION_DEGREE"] = str(data.order)
+
+                        segment = ET.Element("segment")
+                        dump_xml_meta_odm(segment, data, extras=extras, **kwargs)
+                        _xml_write(xf, segment.find("metadata"), 3)
+
+                        xf.write("\n      ")
+                        with xf.element("data"):
+                            _dump_xml_data(xf, data)
+                            xf.write("\n      ")
+                        xf.write("\n    ")
+                    xf.flush()
+                xf.write("\n  ")
+            xf.write("\n")
+
+    buf.write(b"\n")
+
+    return buf.getvalue()
+
+
+def _dump_xml_data(xf, data):
+    """Write the state vectors and covariances of an Ephem in an incremental
+    XML file
+    """
 
-        for el in data:
-            statevector = ET.SubElement(data_tag, "stateVector")
-            epoch = ET.SubElement(statevector, "EPOCH")
-            epoch.text = el.date.strftime(DATE_FMT_DEFAULT)
+    values = _stack_km(data)
 
-            elems = {
-                "X": "x",
-                "Y": "y",
-                "Z": "z",
-                "X_DOT": "vx",
-                "Y_DOT": "vy",
-                "Z_DOT": "vz",
-            }
+    # Local aliases, for the loop below to not look them up at each
+    # state vector
+    element, subelement = ET.Element, ET.SubElement
+    coords, date_fmt = _XML_COORDS, DATE_FMT_DEFAULT
+    inner, outer = _XML_STATEVECTOR_INDENT
 
-            for k, v in elems.items():
-                x = ET.SubElement(
-                    statevector, k, units="km" if "DOT" not in k else "km/s"
-                )
-                x.text = f"{getattr(el, v) / units.km:0.6f}"
+    for el, state_vector in zip(data, values.tolist()):
+        statevector = element("stateVector")
+        statevector.text = inner
+        epoch = subelement(statevector, "EPOCH")
+        epoch.text = el.date.strftime(date_fmt)
+        epoch.tail = inner
 
-        for el in data:
-            if el.cov is not None:
-                cov = ET.SubElement(data_tag, "covarianceMatrix")
+        for (k, unit), value in zip(coords, state_vector):
+            x = subelement(statevector, k, units=unit)
+            x.text = "%0.6f" % value
+            x.tail = inner
 
-                cov_date = ET.SubElement(cov, "EPOCH")
-                cov_date.text = el.date.strftime(DATE_FMT_DEFAULT)
+        # The closing tag is less indented than the children
+        x.tail = outer
+        xf.write(_XML_STATEVECTOR_PREFIX, statevector)
 
-                if el.cov.frame != el.frame:
-                    frame = el.cov.frame
-                    if frame == "QSW":
-                        frame = "RSW"
+    for el in data:
+        el_cov = el.cov
+        if el_cov is not None:
+            cov = ET.Element("covarianceMatrix")
 
-                    cov_frame = ET.SubElement(cov, "COV_REF_FRAME")
-                    cov_frame.text = f"{frame}"
+            cov_date = ET.SubElement(cov, "EPOCH")
+            cov_date.text = el.date.strftime(DATE_FMT_DEFAULT)
 
-                elems = ["X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT"]
-                for i, a in enumerate(elems):
-                    for j, b in enumerate(elems[: i + 1]):
-                        x = ET.SubElement(cov, f"C{a}_{b}")
-                        x.text = f"{el.cov[i, j] / 1000000.0:0.12e}"
+            dump_xml_cov(cov, el_cov)
 
-    return ET.tostring(
-        top, pretty_print=True, xml_declaration=True, encoding="UTF-8"
-    ).decode()
+            _xml_write(xf, cov, 4)
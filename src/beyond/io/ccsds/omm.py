@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 import lxml.etree as ET
 
@@ -5,9 +7,10 @@ from ...orbits import MeanOrbit
 from ...propagators.analytical.sgp4 import Sgp4, wgs72
 from ...propagators.analytical import EcksteinHechler
 
-from .cov import load_cov, dump_cov
+from .cov import load_cov, dump_cov, dump_xml_cov
 from .commons import (
-    xml2dict,
+    xml2fields,
+    xml_bytes,
     kvn2dict,
     parse_date,
     CcsdsError,
@@ -33,14 +36,26 @@ def loads(string, fmt):
     return orb
 
 
-def dumps(data, **kwargs):
+def dumps(data, return_bytes=False, **kwargs):
+    """
+    Args:
+        data (MeanOrbit): object to dump
+        return_bytes (bool): If ``True``, provide the UTF-8 encoded content
+    Return:
+        str or bytes:
+    """
     # Inject a default format if it is not provided, either by argument or by configuration
     fmt = get_format(**kwargs)
 
     if fmt == "kvn":
         string = _dumps_kvn(data, **kwargs)
+        if return_bytes:
+            string = string.encode()
     elif fmt == "xml":
         string = _dumps_xml(data, **kwargs)
+        # The XML is serialized as bytes, and only decoded if needed
+        if not return_bytes:
+            string = string.decode()
     else:  # pragma: no cover
         raise CcsdsError(f"Unknown format '{fmt}'")
 
@@ -125,24 +140,22 @@ def _loads_kvn(string):
     if "CX_X" in data:
         orb.cov = load_cov(orb, data)
 
-    for k in data.keys():
-        if k.startswith("USER_DEFINED"):
-            ud = orb._data.setdefault("ccsds_user_defined", {})
-            ud[k[13:]] = data[k].text
+    if "user_defined" in data:
+        orb._data["ccsds_user_defined"] = data["user_defined"]
 
     return orb
 
 
 def _loads_xml(string):
-    data = xml2dict(string.encode())
-
-    # if "item" in data.keys():
-    #     # To process Space-Track's OMM, wich are not CCSDS compliant...
-    #     data = data["item"]
+    # Only the few needed elements are converted, directly from the XML tree
+    segment = ET.fromstring(xml_bytes(string)).find("body/segment")
+    data = segment.find("data")
 
-    metadata = data["body"]["segment"]["metadata"]
-    mean_elements = data["body"]["segment"]["data"]["meanElements"]
-    cov = data["body"]["segment"]["data"].get("covarianceMatrix")
+    metadata = xml2fields(segment.find("metadata"))
+    mean_elements = xml2fields(data.find("meanElements"))
+    cov = data.find("covarianceMatrix")
+    if cov is not None:
+        cov = xml2fields(cov)
 
     try:
         name = metadata["OBJECT_NAME"].text
@@ -154,7 +167,7 @@ def _loads_xml(string):
         raise CcsdsError(f"Missing mandatory parameter {e}")
 
     if metadata["MEAN_ELEMENT_THEORY"].text in ("SGP/SGP4", "SGP4"):
-        tle_params = data["body"]["segment"]["data"]["tleParameters"]
+        tle_params = xml2fields(data.find("tleParameters"))
         try:
             n = decode_unit(mean_elements, "MEAN_MOTION", "rev/day")
             e = float(mean_elements["ECCENTRICITY"].text)
@@ -208,7 +221,7 @@ def _loads_xml(string):
         kwargs = {}
 
     else:  # pragma: no cover
-        raise CcsdsError(f"Unknown OMM theory '{data['MEAN_ELEMENT_THEORY'].text}'")
+        raise CcsdsError(f"Unknown OMM theory '{metadata['MEAN_ELEMENT_THEORY'].text}'")
 
     orb = MeanOrbit(elements, date, form, frame, propagator, **kwargs)
     orb.name = name
@@ -217,24 +230,41 @@ def _loads_xml(string):
     if cov:
         orb.cov = load_cov(orb, cov)
 
-    ud_dict = data["body"]["segment"]["data"].get("userDefinedParameters", {})
-
-    for field in ud_dict.get("USER_DEFINED", []):
+    for field in data.iterfind("userDefinedParameters/USER_DEFINED"):
         ud = orb._data.setdefault("ccsds_user_defined", {})
-        ud[field.attrib["parameter"]] = field.text
+        ud[field.get("parameter")] = field.text
 
     return orb
 
 
+_THEORIES = {
+    Sgp4: "SGP/SGP4",
+    EcksteinHechler: "ECKSTEIN-HECHLER",
+}
+"""Mean element theory of each propagator class"""
+
+
+@lru_cache(maxsize=None)
+def _theory_from_class(cls):
+    """Search the theory of a propagator class, subclasses included"""
+    for parent in cls.__mro__:
+        if parent in _THEORIES:
+            return _THEORIES[parent]
+    return None
+
+
+def _get_theory(propagator):
+    """Mean element theory to write in an OMM for a given propagator"""
+    theory = _theory_from_class(type(propagator))
+    if theory is None:  # pragma: no cover
+        raise CcsdsError(f"Unknown propagator type '{propagator}' for OMM")
+    return theory
+
+
 def _dumps_kvn(data, **kwargs):
     header = dump_kvn_header(data, "OMM", version="2.0", **kwargs)
 
-    if isinstance(data.propagator, Sgp4):
-        theory = "SGP/SGP4"
-    elif isinstance(data.propagator, EcksteinHechler):
-        theory = "ECKSTEIN-HECHLER"
-    else:  # pragma: no cover
-        raise CcsdsError(f"Unknown propagator type '{data.propagator}' for OMM")
+    theory = _get_theory(data.propagator)
 
     meta = dump_kvn_meta_odm(
         data, meta_tag=False, extras={"MEAN_ELEMENT_THEORY": theory}, **kwargs
@@ -296,15 +326,18 @@ GM                   = {mu:0.1f} [km**3/s**2]
             dfmt=DATE_FMT_DEFAULT,
         )
 
+    # The optional sections are gathered in a list and joined at the end
+    text = [text]
+
     if data.cov is not None:
-        text += dump_cov(data.cov)
+        text.append(dump_cov(data.cov))
 
     if "ccsds_user_defined" in data._data:
-        text += "\n"
+        text.append("\n")
         for k, v in data._data["ccsds_user_defined"].items():
-            text += f"USER_DEFINED_{k} = {v}\n"
+            text.append(f"USER_DEFINED_{k} = {v}\n")
 
-    return header + "\n" + meta + text
+    return header + "\n" + meta + "".join(text)
 
 
 def _dumps_xml(data, **kwargs):
@@ -313,12 +346,7 @@ def _dumps_xml(data, **kwargs):
     body = ET.SubElement(top, "body")
     segment = ET.SubElement(body, "segment")
 
-    if isinstance(data.propagator, Sgp4):
-        theory = "SGP/SGP4"
-    elif isinstance(data.propagator, EcksteinHechler):
-        theory = "ECKSTEIN-HECHLER"
-    else:  # pragma: no cover
-        raise CcsdsError(f"Unknown propagator type '{data.propagator}' for OMM")
+    theory = _get_theory(data.propagator)
 
     dump_xml_meta_odm(segment, data, extras={"MEAN_ELEMENT_THEORY": theory}, **kwargs)
 
@@ -388,19 +416,7 @@ def _dumps_xml(data, **kwargs):
     if data.cov is not None:
         cov = ET.SubElement(data_tag, "covarianceMatrix")
 
-        if data.cov.frame != data.frame:
-            frame = data.cov.frame
-            if frame == "QSW":
-                frame = "RSW"
-
-            cov_frame = ET.SubElement(cov, "COV_REF_FRAME")
-            cov_frame.text = f"{frame}"
-
-        elems = ["X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT"]
-        for i, a in enumerate(elems):
-            for j, b in enumerate(elems[: i + 1]):
-                x = ET.SubElement(cov, f"C{a}_{b}")
-                x.text = f"{data.cov[i, j] / 1000000.0:0.12e}"
+        dump_xml_cov(cov, data.cov)
 
     if "ccsds_user_defined" in data._data:
         ud = ET.SubElement(data_tag, "userDefinedParameters")
@@ -408,6 +424,4 @@ def _dumps_xml(data, **kwargs):
             el = ET.SubElement(ud, "USER_DEFINED", parameter=k)
             el.text = v
 
-    return ET.tostring(
-        top, pretty_print=True, encoding="UTF-8", xml_declaration=True
-    ).decode()
+    return ET.tostring(top, pretty_print=True, encoding="UTF-8", xml_declaration=True)
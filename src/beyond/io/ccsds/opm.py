@@ -7,9 +7,10 @@ from ...orbits.man import ImpulsiveMan, ContinuousMan
 from ...utils import units
 from ...frames.orient import G50, EME2000, GCRF, MOD, TEME, TOD, CIRF
 
-from .cov import load_cov, dump_cov
+from .cov import load_cov, dump_cov, dump_xml_cov
 from .commons import (
     parse_date,
+    frame_name,
     dump_kvn_meta_odm,
     dump_kvn_header,
     dump_xml_header,
@@ -19,6 +20,7 @@ from .commons import (
     DATE_FMT_DEFAULT,
     kvn2dict,
     xml2dict,
+    xml_bytes,
     get_format,
 )
 
@@ -62,13 +64,7 @@ def _loads_kvn(string):
         name = data["OBJECT_NAME"].text
         cospar_id = data["OBJECT_ID"].text
         scale = data["TIME_SYSTEM"].text
-        frame = data["REF_FRAME"].text
-        center = data["CENTER_NAME"].text
-
-        # Convert the frame and center into a beyond frame name
-        # compatible with beyond.env.jpl
-        if center.lower() != "earth":
-            frame = center.title().replace(" ", "")
+        frame = frame_name(data["REF_FRAME"].text, data["CENTER_NAME"].text)
 
         date = parse_date(data["EPOCH"].text, scale)
         vx = decode_unit(data, "X_DOT", "km/s")
@@ -96,9 +92,9 @@ def _loads_kvn(string):
         man["delta_mass"] = raw_man["MAN_DELTA_MASS"].text
         man["comment"] = raw_man["COMMENT"].text if "COMMENT" in raw_man else None
 
-        for i in range(1, 4):
-            f_name = f"MAN_DV_{i}"
-            man.setdefault("dv", []).append(decode_unit(raw_man, f_name, "km/s"))
+        man["dv"] = [
+            decode_unit(raw_man, f"MAN_DV_{i}", "km/s") for i in range(1, 4)
+        ]
 
         if man["duration"].total_seconds() == 0:
             orb.maneuvers.append(
@@ -124,16 +120,14 @@ def _loads_kvn(string):
     if "CX_X" in data:
         orb.cov = load_cov(orb, data)
 
-    for k in data.keys():
-        if k.startswith("USER_DEFINED"):
-            ud = orb._data.setdefault("ccsds_user_defined", {})
-            ud[k[13:]] = data[k].text
+    if "user_defined" in data:
+        orb._data["ccsds_user_defined"] = data["user_defined"]
 
     return orb
 
 
 def _loads_xml(string):
-    data = xml2dict(string.encode())
+    data = xml2dict(xml_bytes(string))
 
     metadata = data["body"]["segment"]["metadata"]
     statevector = data["body"]["segment"]["data"]["stateVector"]
@@ -146,13 +140,7 @@ def _loads_xml(string):
         name = metadata["OBJECT_NAME"].text
         cospar_id = metadata["OBJECT_ID"].text
         scale = metadata["TIME_SYSTEM"].text
-        frame = metadata["REF_FRAME"].text
-        center = metadata["CENTER_NAME"].text
-
-        # Convert the frame and center into a beyond frame name
-        # compatible with beyond.env.jpl
-        if center.lower() != "earth":
-            frame = center.title().replace(" ", "")
+        frame = frame_name(metadata["REF_FRAME"].text, metadata["CENTER_NAME"].text)
 
         date = parse_date(statevector["EPOCH"].text, scale)
         vx = decode_unit(statevector, "X_DOT", "km/s")
@@ -183,9 +171,9 @@ def _loads_xml(string):
             man["delta_mass"] = raw_man["MAN_DELTA_MASS"].text
             man["comment"] = raw_man["COMMENT"].text if "COMMENT" in raw_man else None
 
-            for i in range(1, 4):
-                f_name = f"MAN_DV_{i}"
-                man.setdefault("dv", []).append(decode_unit(raw_man, f_name, "km/s"))
+            man["dv"] = [
+                decode_unit(raw_man, f"MAN_DV_{i}", "km/s") for i in range(1, 4)
+            ]
 
             if man["duration"].total_seconds() == 0:
                 orb.maneuvers.append(
@@ -221,46 +209,51 @@ def _loads_xml(string):
 
 
 def _dumps_kvn(data, *, kep=True, **kwargs):
-    cart = data.copy(form="cartesian")
+    # No conversion, hence no copy, is needed if the data is already cartesian
+    cart = data if data.form.name == "cartesian" else data.copy(form="cartesian")
 
     header = dump_kvn_header(data, "OPM", version="2.0", **kwargs)
 
     meta = dump_kvn_meta_odm(data, **kwargs)
 
-    text = """COMMENT  State Vector
-EPOCH                = {cartesian.date:{dfmt}}
-X                    = {cartesian.x: 12.6f} [km]
-Y                    = {cartesian.y: 12.6f} [km]
-Z                    = {cartesian.z: 12.6f} [km]
-X_DOT                = {cartesian.vx: 12.6f} [km/s]
-Y_DOT                = {cartesian.vy: 12.6f} [km/s]
-Z_DOT                = {cartesian.vz: 12.6f} [km/s]
-""".format(
-        cartesian=cart / units.km,
-        dfmt=DATE_FMT_DEFAULT,
-    )
+    # The values are scaled on a bare array, without creating an
+    # intermediate StateVector
+    x, y, z, vx, vy, vz = np.asarray(cart) / units.km
+
+    # The sections are gathered in a list and joined at the end
+    text = [
+        f"""COMMENT  State Vector
+EPOCH                = {cart.date:{DATE_FMT_DEFAULT}}
+X                    = {x: 12.6f} [km]
+Y                    = {y: 12.6f} [km]
+Z                    = {z: 12.6f} [km]
+X_DOT                = {vx: 12.6f} [km/s]
+Y_DOT                = {vy: 12.6f} [km/s]
+Z_DOT                = {vz: 12.6f} [km/s]
+"""
+    ]
 
     if kep and cart.frame.orientation in (G50, EME2000, GCRF, MOD, TOD, TEME, CIRF):
-        kep = data.copy(form="keplerian")
-        text += """
+        kep = data if data.form.name == "keplerian" else data.copy(form="keplerian")
+        a, e = kep.a / units.km, kep.e
+        inc, raan, omega, nu = np.degrees(kep[2:])
+        gm = kep.frame.center.body.mu / (units.km**3)
+        text.append(
+            f"""
 COMMENT  Keplerian elements
-SEMI_MAJOR_AXIS      = {kep_a: 12.6f} [km]
-ECCENTRICITY         = {kep_e: 12.6f}
-INCLINATION          = {angles[0]: 12.6f} [deg]
-RA_OF_ASC_NODE       = {angles[1]: 12.6f} [deg]
-ARG_OF_PERICENTER    = {angles[2]: 12.6f} [deg]
-TRUE_ANOMALY         = {angles[3]: 12.6f} [deg]
+SEMI_MAJOR_AXIS      = {a: 12.6f} [km]
+ECCENTRICITY         = {e: 12.6f}
+INCLINATION          = {inc: 12.6f} [deg]
+RA_OF_ASC_NODE       = {raan: 12.6f} [deg]
+ARG_OF_PERICENTER    = {omega: 12.6f} [deg]
+TRUE_ANOMALY         = {nu: 12.6f} [deg]
 GM                   = {gm:11.4f} [km**3/s**2]
-""".format(
-            kep_a=kep.a / units.km,
-            kep_e=kep.e,
-            angles=np.degrees(kep[2:]),
-            gm=kep.frame.center.body.mu / (units.km**3),
+"""
         )
 
     # Covariance handling
     if cart.cov is not None:
-        text += dump_cov(cart.cov)
+        text.append(dump_cov(cart.cov))
 
     if cart.maneuvers:
         for i, man in enumerate(cart.maneuvers):
@@ -280,33 +273,31 @@ GM                   = {gm:11.4f} [km**3/s**2]
                 date = man.date
                 duration = 0
 
-            text += """{comment}
-MAN_EPOCH_IGNITION   = {date:{dfmt}}
+            dv1, dv2, dv3 = man._dv / units.km
+
+            text.append(
+                f"""{comment}
+MAN_EPOCH_IGNITION   = {date:{DATE_FMT_DEFAULT}}
 MAN_DURATION         = {duration:0.3f} [s]
 MAN_DELTA_MASS       = 0.000 [kg]
 MAN_REF_FRAME        = {frame}
-MAN_DV_1             = {dv[0]:.6f} [km/s]
-MAN_DV_2             = {dv[1]:.6f} [km/s]
-MAN_DV_3             = {dv[2]:.6f} [km/s]
-""".format(
-                date=date,
-                duration=duration,
-                dv=man._dv / units.km,
-                frame=frame,
-                comment=comment,
-                dfmt=DATE_FMT_DEFAULT,
+MAN_DV_1             = {dv1:.6f} [km/s]
+MAN_DV_2             = {dv2:.6f} [km/s]
+MAN_DV_3             = {dv3:.6f} [km/s]
+"""
             )
 
     if "ccsds_user_defined" in data._data:
-        text += "\n"
+        text.append("\n")
         for k, v in data._data["ccsds_user_defined"].items():
-            text += f"USER_DEFINED_{k} = {v}\n"
+            text.append(f"USER_DEFINED_{k} = {v}\n")
 
-    return header + "\n" + meta + text
+    return header + "\n" + meta + "".join(text)
 
 
 def _dumps_xml(data, *, kep=True, **kwargs):
-    cart = data.copy(form="cartesian")
+    # No conversion, hence no copy, is needed if the data is already cartesian
+    cart = data if data.form.name == "cartesian" else data.copy(form="cartesian")
 
     # Write an intermediary, with field name, unit and value
     # like a dict of tuple
@@ -341,7 +332,7 @@ def _dumps_xml(data, *, kep=True, **kwargs):
         x.text = f"{getattr(cart, v) / units.km:0.6f}"
 
     if kep and cart.frame.orientation in (G50, EME2000, GCRF, MOD, TOD, TEME, CIRF):
-        kep = data.copy(form="keplerian")
+        kep = data if data.form.name == "keplerian" else data.copy(form="keplerian")
         keplerian = ET.SubElement(data_tag, "keplerianElements")
 
         sma = ET.SubElement(keplerian, "SEMI_MAJOR_AXIS", units="km")
@@ -366,19 +357,7 @@ def _dumps_xml(data, *, kep=True, **kwargs):
     if cart.cov is not None:
         cov = ET.SubElement(data_tag, "covarianceMatrix")
 
-        if cart.cov.frame != cart.frame:
-            frame = cart.cov.frame
-            if frame == "QSW":
-                frame = "RSW"
-
-            cov_frame = ET.SubElement(cov, "COV_REF_FRAME")
-            cov_frame.text = f"{frame}"
-
-        elems = ["X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT"]
-        for i, a in enumerate(elems):
-            for j, b in enumerate(elems[: i + 1]):
-                x = ET.SubElement(cov, f"C{a}_{b}")
-                x.text = f"{cart.cov[i, j] / 1000000.0:0.12e}"
+        dump_xml_cov(cov, cart.cov)
 
     if cart.maneuvers:
         for man in cart.maneuvers:
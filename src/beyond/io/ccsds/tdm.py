@@ -1,4 +1,6 @@
-import numpy as np
+from io import StringIO
+from math import pi
+
 import lxml.etree as ET
 
 from ...constants import c
@@ -7,14 +9,20 @@ from ...utils.measures import MeasureSet, Range, Azimut, Elevation, Doppler
 
 from .commons import (
     CcsdsError,
-    parse_date,
+    cached_parse_date,
     dump_kvn_header,
     dump_xml_header,
     DATE_FMT_DEFAULT,
     xml2dict,
+    xml_bytes,
     get_format,
 )
 
+# Plain multiplications are used instead of np.radians() and np.degrees(),
+# which are costly when called on individual values
+_DEG2RAD = pi / 180.0
+_RAD2DEG = 180.0 / pi
+
 
 def loads(string, fmt="kvn"):
     """Read CCSDS TDM format and convert it to a MeasureSet"""
@@ -40,28 +48,83 @@ def dumps(data, **kwargs):
     return string
 
 
+def _measure_builders(range_units, angle_type):
+    """Functions creating the measures of a TDM segment, by keyword
+
+    The metadata of the segment (units and type of angles) is taken into
+    account once, instead of for each measure.
+
+    Args:
+        range_units (str): RANGE_UNITS field of the metadata
+        angle_type (str): ANGLE_TYPE field of the metadata
+    Return:
+        dict: Each function has the signature ``(path, date, value)``, the
+        value being read directly from the file
+    """
+
+    r_unit = units.km
+    if range_units == "s":
+        r_unit *= c
+
+    builders = {"RANGE": lambda path, date, value: Range(path, date, value * r_unit)}
+
+    if angle_type == "AZEL":
+        builders["ANGLE_1"] = lambda path, date, value: Azimut(
+            path, date, -value * _DEG2RAD
+        )
+        builders["ANGLE_2"] = lambda path, date, value: Elevation(
+            path, date, value * _DEG2RAD
+        )
+
+    return builders
+
+
 def _loads_kvn(string):
+    """
+    Args:
+        string (str or file-like): Text of the TDM, or text stream to read
+            it from
+    Return:
+        MeasureSet or List[MeasureSet]
+    """
+    parse_date = cached_parse_date()
     mode = "meta"
     meta = {}
+    # Participants, by index
+    participants = {}
     sets = []
-    for i, line in enumerate(string.splitlines()):
-        if not line or line.startswith("COMMENT"):
+
+    # Lines are read one at a time, instead of building the list of all
+    # the lines of the file beforehand
+    if not hasattr(string, "read"):
+        string = StringIO(string, newline=None)
+
+    for line in string:
+        line = line.rstrip("\r\n")
+        if not line:
             continue
-        elif line.startswith("DATA_START"):
-            participants = [
-                v for k, v in sorted(meta.items()) if k.startswith("PARTICIPANT_")
-            ]
+
+        # Checking the first character avoids most of the calls
+        # to startswith() for measurement lines
+        first = line[0]
+        if first == "C" and line.startswith("COMMENT"):
+            continue
+        elif first == "D" and line.startswith("DATA_START"):
             path_txt = meta["PATH"]
-            path = [participants[int(p) - 1] for p in path_txt.split(",")]
+            # As a tuple, the path is shared by all the measures, instead of
+            # being copied by each of them
+            path = tuple(participants[int(p)] for p in path_txt.split(","))
             scale = meta["TIME_SYSTEM"]
             mode = "data"
-            r_unit = units.km
-            if meta.get("RANGE_UNITS") == "s":
-                r_unit *= c
-            data = MeasureSet()
+            builders = _measure_builders(
+                meta.get("RANGE_UNITS"), meta.get("ANGLE_TYPE")
+            )
+            # The measures are gathered in a plain list, converted into
+            # a MeasureSet once complete
+            data = []
             sets.append(data)
             continue
-        elif line.startswith("DATA_STOP"):
+        elif first == "D" and line.startswith("DATA_STOP"):
             mode = "meta"
             continue
 
@@ -71,21 +134,19 @@ def _loads_kvn(string):
 
         if mode == "meta":
             meta[key] = value
+            if key.startswith("PARTICIPANT_"):
+                participants[int(key[12:])] = value
         elif mode == "data":
             date, value = value.split()
             date = parse_date(date.strip(), scale)
             value = float(value)
 
-            if key == "RANGE":
-                obj = Range(path, date, value * r_unit)
-            elif key == "ANGLE_1" and meta["ANGLE_TYPE"] == "AZEL":
-                obj = Azimut(path, date, np.radians(-value))
-            elif key == "ANGLE_2" and meta["ANGLE_TYPE"] == "AZEL":
-                obj = Elevation(path, date, np.radians(value))
-            else:
+            if key not in builders:
                 raise CcsdsError(f"Unknown type : {key}")
 
-            data.append(obj)
+            data.append(builders[key](path, date, value))
+
+    sets = [MeasureSet(x) for x in sets]
 
     if len(sets) == 1:
         sets = sets.pop()
@@ -94,7 +155,8 @@ def _loads_kvn(string):
 
 
 def _loads_xml(string):
-    data = xml2dict(string.encode())
+    data = xml2dict(xml_bytes(string))
+    parse_date = cached_parse_date()
 
     sets = []
     segments = data["body"]["segment"]
@@ -104,38 +166,33 @@ def _loads_xml(string):
 
     for segment in segments:
         meta = segment["metadata"]
-        measures = MeasureSet()
+        measures = []
         sets.append(measures)
 
-        participants = [
-            v.text
-            for k, v in sorted(segment["metadata"].items())
-            if k.startswith("PARTICIPANT_")
-        ]
+        participants = {
+            int(k[12:]): v.text for k, v in meta.items() if k.startswith("PARTICIPANT_")
+        }
         path_txt = meta["PATH"].text
-        path = [participants[int(p) - 1] for p in path_txt.split(",")]
+        path = tuple(participants[int(p)] for p in path_txt.split(","))
         scale = meta["TIME_SYSTEM"].text
 
-        if "RANGE_UNITS" in meta:
-            r_unit = units.km
-            if meta["RANGE_UNITS"].text == "s":
-                r_unit *= c
-        if "ANGLE_TYPE" in meta:
-            angle_type = meta["ANGLE_TYPE"].text
+        builders = _measure_builders(
+            meta["RANGE_UNITS"].text if "RANGE_UNITS" in meta else None,
+            meta["ANGLE_TYPE"].text if "ANGLE_TYPE" in meta else None,
+        )
 
         for obs in segment["data"]["observation"]:
             date = parse_date(obs.pop("EPOCH").text, scale)
             meas_type, value = list(obs.items())[0]
             value = float(value.text)
-            if meas_type == "RANGE":
-                measures.append(Range(path, date, value * r_unit))
-            elif meas_type == "ANGLE_1" and angle_type == "AZEL":
-                measures.append(Azimut(path, date, np.radians(-value)))
-            elif meas_type == "ANGLE_2" and angle_type == "AZEL":
-                measures.append(Elevation(path, date, np.radians(value)))
-            else:
+
+            if meas_type not in builders:
                 raise CcsdsError(f"Unknown type : {meas_type}")
 
+            measures.append(builders[meas_type](path, date, value))
+
+    sets = [MeasureSet(x) for x in sets]
+
     if len(sets) == 1:
         sets = sets.pop()
 
@@ -181,29 +238,46 @@ def encode_measurement(m):
     elif isinstance(m, Azimut):
         name = "ANGLE_1"
         value_fmt = ".2f"
-        value = -np.degrees(m.value) % 360
+        value = -m.value * _RAD2DEG % 360
     elif isinstance(m, Elevation):
         name = "ANGLE_2"
         value_fmt = ".2f"
-        value = np.degrees(m.value)
+        value = m.value * _RAD2DEG
     # elif isinstance(m, RightAscension):
     #     name = "ANGLE_1"
     #     value_fmt = ".8f"
-    #     value = np.degrees(m.value)
+    #     value = m.value * _RAD2DEG
     # elif isinstance(m, Declination):
     #     name = "ANGLE_2"
     #     value_fmt = ".8f"
-    #     value = np.degrees(m.value)
+    #     value = m.value * _RAD2DEG
 
     return name, value, value_fmt
 
 
+def _group_by_path(data):
+    """Split a MeasureSet by path, in a single pass over the measures
+
+    Args:
+        data (MeasureSet):
+    Return:
+        List[Tuple[tuple, MeasureSet]]: paths in order of first appearance,
+        each with its measures
+    """
+    groups = {}
+    for m in data:
+        if hasattr(m, "path"):
+            groups.setdefault(m.path, []).append(m)
+
+    return [(path, MeasureSet(measures)) for path, measures in groups.items()]
+
+
 def _dumps_kvn(data, **kwargs):
-    filtered = ((path, data.filter(path=path)) for path in data.paths)
+    filtered = _group_by_path(data)
 
     header = dump_kvn_header(data, "TDM", **kwargs)
 
-    text = ""
+    text = []
     for path, measure_set in filtered:
         meta = collect_metadata(path, measure_set)
 
@@ -232,13 +306,13 @@ def _dumps_kvn(data, **kwargs):
         txt.append("DATA_STOP")
         txt.append("")
 
-        text += "\n".join(txt)
+        text.append("\n".join(txt))
 
-    return header + "\n" + text
+    return header + "\n" + "".join(text)
 
 
 def _dumps_xml(data, **kwargs):
-    filtered = ((path, data.filter(path=path)) for path in data.paths)
+    filtered = _group_by_path(data)
 
     top = dump_xml_header(data, "TDM", version="1.0", **kwargs)
 
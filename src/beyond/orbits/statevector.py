@@ -39,7 +39,7 @@ class AbstractStateVector(np.ndarray, metaclass=ABCMeta):
             frame = get_frame(frame)
 
         obj = np.ndarray.__new__(
-            cls, (6,), buffer=np.array([float(x) for x in coord]), dtype=float
+            cls, (6,), buffer=np.array(coord, dtype=float), dtype=float
         )
 
         kwargs["date"] = date
@@ -248,10 +248,7 @@ StateVector =
         changing the frame of the statevector will trigger the change of its
         covariance frame.
         """
-        if "cov" not in self._data.keys():
-            self._data["cov"] = None
-
-        return self._data["cov"]
+        return self._data.setdefault("cov", None)
 
     @cov.setter
     def cov(self, value):
@@ -309,6 +306,10 @@ StateVector =
     def form(self, new_form):
         if isinstance(new_form, str):
             new_form = get_form(new_form)
+        if new_form is self._data["form"]:
+            # Nothing to convert. This spares a copy of the orbit when a whole
+            # Ephem is set to the form it already has (e.g. before a dump)
+            return
         self.base.setfield(self._data["form"](self, new_form), dtype=float)
         self._data["form"] = new_form
 
@@ -9,52 +9,88 @@ rotation matrices.
 import numpy as np
 
 
-def rot1(theta):
+def _rot(i, j, theta, out=None):
+    """Generic rotation matrix in the (i, j) plane
+
+    Args:
+        i (int): index of the first axis of the plane of rotation
+        j (int): index of the second axis of the plane of rotation
+        theta (float): Angle in radians
+        out (numpy.ndarray): 3x3 array in which to write the result. If ``None``
+            a new array is allocated
+    Return:
+        numpy.ndarray
+    """
+    if out is None:
+        out = np.empty((3, 3))
+
+    c, s = np.cos(theta), np.sin(theta)
+
+    out[:] = 0
+    out[3 - i - j, 3 - i - j] = 1
+    out[i, i] = c
+    out[i, j] = s
+    out[j, i] = -s
+    out[j, j] = c
+
+    return out
+
+
+def rot1(theta, out=None):
     """
     Args:
         theta (float): Angle in radians
+        out (numpy.ndarray): 3x3 array in which to write the result. If ``None``
+            a new array is allocated
     Return:
         Rotation matrix of angle theta around the X-axis
+
+    Example:
+
+    >>> print(rot1(np.pi / 2).round(12))
+    [[ 1.  0.  0.]
+     [ 0.  0.  1.]
+     [ 0. -1.  0.]]
     """
-    return np.array(
-        [
-            [1, 0, 0],
-            [0, np.cos(theta), np.sin(theta)],
-            [0, -np.sin(theta), np.cos(theta)],
-        ]
-    )
+    return _rot(1, 2, theta, out)
 
 
-def rot2(theta):
+def rot2(theta, out=None):
     """
     Args:
         theta (float): Angle in radians
+        out (numpy.ndarray): 3x3 array in which to write the result. If ``None``
+            a new array is allocated
     Return:
         Rotation matrix of angle theta around the Y-axis
+
+    Example:
+
+    >>> print(rot2(np.pi / 2).round(12))
+    [[ 0.  0. -1.]
+     [ 0.  1.  0.]
+     [ 1.  0.  0.]]
     """
-    return np.array(
-        [
-            [np.cos(theta), 0, -np.sin(theta)],
-            [0, 1, 0],
-            [np.sin(theta), 0, np.cos(theta)],
-        ]
-    )
+    return _rot(2, 0, theta, out)
 
 
-def rot3(theta):
+def rot3(theta, out=None):
     """
     Args:
         theta (float): Angle in radians
+        out (numpy.ndarray): 3x3 array in which to write the result. If ``None``
+            a new array is allocated
     Return:
         Rotation matrix of angle theta around the Z-axis
+
+    Example:
+
+    >>> print(rot3(np.pi / 2).round(12))
+    [[ 0.  1.  0.]
+     [-1.  0.  0.]
+     [ 0.  0.  1.]]
     """
-    return np.array(
-        [
-            [np.cos(theta), np.sin(theta), 0],
-            [-np.sin(theta), np.cos(theta), 0],
-            [0, 0, 1],
-        ]
-    )
+    return _rot(0, 1, theta, out)
 
 
 def expand(m, rate=None):
@@ -93,11 +129,33 @@ def expand(m, rate=None):
 
     if rate is not None:
         # v' = m (v - w x r)
-        # converted into matrix, such as W v = w x v
-        # This is the equivalent of W = np.cross(np.identity(3), rate)
-        W = np.array(
-            [[0, -rate[2], rate[1]], [rate[2], 0, -rate[0]], [-rate[1], rate[0], 0]]
-        )
-        out[3:, :3] = -m @ W
+        out[3:, :3] = -m @ _rate2mat(rate)
 
     return out
+
+
+_SKEW_SIGN = np.array([[0.0, -1.0, 1.0], [1.0, 0.0, -1.0], [-1.0, 1.0, 0.0]])
+_SKEW_INDEX = np.array([[0, 2, 1], [2, 0, 0], [1, 0, 0]])
+
+
+def _rate2mat(rate, out=None):
+    """Convert a rotation rate vector into a matrix W, such as W v = w x v
+
+    This is the equivalent of W = np.cross(np.identity(3), rate)
+
+    Args:
+        rate (numpy.array) : 1D 3 elements vector, or Nx3 array of vectors
+        out (numpy.ndarray) : 3x3 (or Nx3x3) array in which to write the result
+    Return:
+        numpy.ndarray : 3x3 skew-symmetric matrix, or Nx3x3 array of matrices
+
+    Example:
+
+    >>> print(_rate2mat([1, 2, 3]))
+    [[ 0. -3.  2.]
+     [ 3.  0. -1.]
+     [-2.  1.  0.]]
+    """
+    # The elements of the rate vector are gathered at their place in the
+    # matrix, and their sign applied, in a single pass
+    return np.multiply(_SKEW_SIGN, np.asarray(rate).take(_SKEW_INDEX, axis=-1), out=out)
@@ -9,12 +9,13 @@ from numpy.testing import assert_almost_equal
 from numpy.linalg import norm
 
 from beyond.errors import UnknownFrameError
-from beyond.dates import Date
+from beyond.dates import Date, timedelta
 from beyond.dates.eop import Eop
 from beyond.orbits.orbit import Orbit
 from beyond.orbits.statevector import StateVector
 from beyond.io.tle import Tle
 from beyond.frames.frames import *
+from beyond.frames.frames import orbit2frame
 
 
 @fixture
@@ -195,6 +196,62 @@ def test_change_tle(helper):
         helper.assert_vector(eme2000_ref, tle)
 
 
+def test_cache(date):
+
+    m1 = ITRF.orientation.convert_to(date, GCRF.orientation)
+
+    # Modifying the returned matrix has no effect on the cached value
+    m1[0, 0] = 2.
+    m2 = ITRF.orientation.convert_to(date, GCRF.orientation)
+    assert m2[0, 0] != m1[0, 0]
+
+    # Different EOP for the same instant leads to a different matrix
+    with patch('beyond.dates.date.EopDb.get') as m:
+        m.return_value = Eop(
+            x=0, y=0, dpsi=0, deps=0, dx=0, dy=0, lod=0, ut1_utc=-0.4399619, tai_utc=32
+        )
+        date2 = Date(date.d, date.s)
+
+    assert date2 == date
+    m3 = ITRF.orientation.convert_to(date2, GCRF.orientation)
+    assert not np.allclose(m2, m3, rtol=0, atol=1e-9)
+
+
+def test_transitions(date):
+
+    from beyond.frames.orient import Orientation
+
+    func, reverse = Orientation._transitions[("TOD", "TEME")]
+    assert reverse
+    assert func is Orientation._transitions[("TEME", "TOD")][0]
+
+    # Transitions only defined as methods are still reachable
+    a, b = Orientation("A"), Orientation("B")
+    a + b
+    a.A_to_B = lambda date: (2 * np.identity(3), None)
+
+    assert_almost_equal(a.convert_to(date, b), 2 * np.identity(6))
+    assert_almost_equal(a.convert_to(date, a), np.identity(6))
+
+
+def test_cache_local_orbital(date):
+    """Matrices of local orbital orientations follow the changes of their
+    reference orbit
+    """
+
+    sv = StateVector([7000000, 0, 0, 0, 7500, 0], date, "cartesian", "EME2000")
+    frame = orbit2frame("cache_qsw", sv, orientation="QSW", exists_warning=False)
+
+    m1 = frame.orientation.convert_to(date, EME2000.orientation)
+
+    sv[:] = [0, 7000000, 0, -7500, 0, 0]
+    m2 = frame.orientation.convert_to(date, EME2000.orientation)
+
+    ref = orbit2frame("cache_qsw_ref", sv.copy(), orientation="QSW", exists_warning=False)
+    assert not np.allclose(m1, m2)
+    assert_almost_equal(m2, ref.orientation.convert_to(date, EME2000.orientation))
+
+
 def test_errors(ref_orbit):
 
     with raises(UnknownFrameError):
@@ -238,3 +295,14 @@ def test_orbit2frame(helper):
     # same relative positions, but expressed in differents frames
     assert_almost_equal(norm(s1[:3]), norm(s2[:3]), decimal=5)
     assert_almost_equal(norm(s2[:3]), norm(s3[:3]))
+
+
+def test_convert_to_batch(date):
+
+    dates = [date + timedelta(hours=i) for i in range(3)]
+
+    for start, stop in [(ITRF, GCRF), (EME2000, TEME), (GCRF, GCRF)]:
+        ms = start.orientation.convert_to_batch(dates, stop.orientation)
+        assert ms.shape == (3, 6, 6)
+        for d, m in zip(dates, ms):
+            assert_almost_equal(m, start.orientation.convert_to(d, stop.orientation))
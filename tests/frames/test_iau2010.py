@@ -5,6 +5,7 @@ import numpy as np
 from pytest import fixture
 from unittest.mock import patch
 
+from beyond.config import config
 from beyond.dates.date import Date
 from beyond.dates.eop import Eop
 from beyond.frames.iau2010 import _earth_orientation, _sideral, _planets, _xys, _xysxy2
@@ -70,4 +71,21 @@ def test_xys(date):
 
     # Check of the value of s
     _, _, s = np.degrees(_xys(date)) * 3600.
-    assert abs(s + 0.003027) < 1e-6
\ No newline at end of file
+    assert abs(s + 0.003027) < 1e-6
+
+
+def test_xys_abridged(date):
+
+    X, Y, s_xy2 = _xysxy2(date)
+
+    config.set("env", "iau_model", "B")
+    try:
+        Xb, Yb, s_xy2b = _xysxy2(date)
+    finally:
+        del config["env"]["iau_model"]
+
+    # Agreement of the abridged model within 1 milli-arcsecond
+    assert X != Xb
+    assert abs(X - Xb) < 1e-3
+    assert abs(Y - Yb) < 1e-3
+    assert abs(s_xy2 - s_xy2b) < 1e-3
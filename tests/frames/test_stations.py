@@ -6,7 +6,7 @@ from beyond.dates import Date, timedelta
 from beyond.orbits import Orbit
 from beyond.io.tle import Tle
 from beyond.propagators.listeners import SignalEvent, MaxEvent, MaskEvent, stations_listeners
-from beyond.frames.stations import TopocentricFrame
+from beyond.frames.stations import TopocentricFrame, create_station
 
 
 def test_station(station, helper):
@@ -138,4 +138,41 @@ def test_geodetic_cartesian(case):
     sv_station = TopocentricFrame._geodetic_to_cartesian(phi, theta, r)
 
     assert np.linalg.norm(sv_station) - np.linalg.norm(ref) < 1e-1
-    assert np.allclose(sv_station, ref)
\ No newline at end of file
+    assert np.allclose(sv_station, ref)
+
+
+def test_geodetic_cartesian_batch():
+
+    r, theta, phi = np.array([x[0] for x in _cases.values()]).T
+    ref = np.array([x[1] for x in _cases.values()])
+
+    sv_stations = TopocentricFrame._geodetic_to_cartesian(phi, theta, r)
+
+    assert sv_stations.shape == (len(_cases), 6)
+    assert np.allclose(sv_stations, ref)
+
+
+def test_station_matrix_cached(station):
+    m = station.orientation._to_parent(Date.now())[0]
+    assert m is station.orientation._to_parent(Date.now())[0]
+    assert not m.flags.writeable
+
+
+def test_station_matrix_shared():
+    a = create_station("AntennaA", (43.604482, 1.443962, 172.0))
+    b = create_station("AntennaB", (43.604482, 1.443962, 180.0))
+    assert a.orientation._m is b.orientation._m
+
+
+def test_station_mask_duplicated_azimuth():
+    station = create_station(
+        "MaskStep",
+        (43.604482, 1.443962, 172.0),
+        mask=[[0, 1, 1, 2, 3], [0.1, 0.1, 0.5, 0.5, 0.2]],
+    )
+
+    # On a vertical step of the mask, the first elevation prevails
+    assert station.get_mask(1.0) == 0.1
+    assert station.get_mask(2.0) == 0.5
+    assert np.isclose(station.get_mask(1.5), 0.5)
+    assert np.isclose(station.get_mask(0.5), 0.1)
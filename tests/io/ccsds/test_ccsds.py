@@ -3,6 +3,13 @@ from pathlib import Path
 from pytest import raises
 
 from beyond.io.ccsds import dumps, loads, CcsdsError
+from beyond.io.ccsds.commons import (
+    parse_date,
+    cached_parse_date,
+    frame_name,
+    xml2dict,
+    _xml2dict_stream,
+)
 
 
 def test_dummy(ccsds_format):
@@ -14,6 +21,76 @@ def test_dummy(ccsds_format):
         loads("dummy text")
 
 
+def test_parse_date():
+
+    assert str(parse_date("2020-03-15T12:34:56.789", "UTC")) == "2020-03-15T12:34:56.789000 UTC"
+    assert str(parse_date("2020-03-15T12:34:56", "TAI")) == "2020-03-15T12:34:56 TAI"
+    assert str(parse_date("2020-075T12:34:56.789", "UTC")) == "2020-03-15T12:34:56.789000 UTC"
+    assert str(parse_date("2020-366T00:00:00.5", "UTC")) == "2020-12-31T00:00:00.500000 UTC"
+    assert str(parse_date("2020-03-15T12:34:56.000001", "UTC")) == "2020-03-15T12:34:56.000001 UTC"
+    assert str(parse_date("2020-1-15T00:00:00", "UTC")) == "2020-01-15T00:00:00 UTC"
+    assert str(parse_date("2020-1-15T00:00:00.5", "UTC")) == "2020-01-15T00:00:00.500000 UTC"
+
+    with raises(ValueError):
+        parse_date("2020/03/15 12:34:56", "UTC")
+
+    with raises(ValueError):
+        parse_date("2020-13-15T12:34:56", "UTC")
+
+    with raises(ValueError):
+        parse_date("2020-000T12:34:56.789", "UTC")
+
+    with raises(ValueError):
+        parse_date("2020-03-15T12:34:56.1234567", "UTC")
+
+    parse = cached_parse_date()
+    date = parse("2020-03-15T12:34:56.789", "UTC")
+    assert parse("2020-03-15T12:34:56.789", "UTC") is date
+    assert parse("2020-03-15T12:34:56.789", "TAI") is not date
+    assert cached_parse_date()("2020-03-15T12:34:56.789", "UTC") is not date
+
+
+def test_frame_name():
+
+    assert frame_name("EME2000", "EARTH") == "EME2000"
+    assert frame_name("ICRF", "MARS BARYCENTER") == "MarsBarycenter"
+    assert frame_name("ICRF", "MARS BARYCENTER") is frame_name("EME2000", "MARS BARYCENTER")
+
+
+def test_xml2dict_stream():
+
+    def simplify(x):
+        if isinstance(x, dict):
+            return {k: simplify(v) for k, v in x.items()}
+        elif isinstance(x, list):
+            return [simplify(v) for v in x]
+        return x.text, dict(x.attrib)
+
+    folder = Path(__file__).parent.joinpath("data/")
+    for path in folder.glob("*.xml"):
+        string = path.read_bytes()
+        assert simplify(_xml2dict_stream(string)) == simplify(xml2dict(string))
+
+
+def test_load_bytes(datafile, ccsds_format, helper):
+    """Files read in binary mode are accepted as well as text"""
+
+    for name in ("oem", "opm", "tdm"):
+        txt = datafile(name)
+        data = loads(txt.encode())
+        ref = loads(txt)
+        assert type(data) is type(ref)
+        helper.assert_string(
+            dumps(ref, fmt=ccsds_format), dumps(data, fmt=ccsds_format)
+        )
+
+    txt = datafile("omm")
+    assert list(loads(txt.encode())) == list(loads(txt))
+
+    with raises(CcsdsError):
+        loads(b"dummy text")
+
+
 def test_xsd(helper):
 
     folder = Path(__file__).parent.joinpath("data/")
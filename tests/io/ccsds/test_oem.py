@@ -1,6 +1,10 @@
+from io import StringIO
+
 from pytest import raises, fixture, mark
 
-from beyond.io.ccsds import dumps, loads, CcsdsError
+from beyond.io.ccsds import dump, dumps, loads, CcsdsError
+from beyond.io.ccsds import oem
+from beyond.io.ccsds.oem import _loads_kvn
 from beyond.dates import timedelta
 from beyond.orbits.cov import Cov
 
@@ -28,6 +32,27 @@ def test_dump_oem(ephem, datafile, ccsds_format, helper):
     helper.assert_string(ref, txt)
 
 
+def test_dump_oem_bytes(ephem, datafile, ccsds_format, helper):
+
+    ref = datafile("oem")
+    data = dumps(ephem, fmt=ccsds_format, return_bytes=True)
+
+    assert isinstance(data, bytes)
+    helper.assert_string(ref, data.decode())
+
+
+def test_dump_oem_stream(ephem, ephem2, ccsds_format, monkeypatch, helper):
+
+    # Small buffer, in order to have several writes
+    monkeypatch.setattr(oem, "_WRITE_BUFFER_SIZE", 1000)
+
+    fp = StringIO()
+    dump([ephem, ephem2], fp, fmt=ccsds_format)
+
+    ref = dumps([ephem, ephem2], fmt=ccsds_format)
+    helper.assert_string(ref, fp.getvalue())
+
+
 def test_dump_double_oem(ephem, ephem2, datafile, ccsds_format, helper):
 
     ref = datafile("oem_double")
@@ -36,6 +61,15 @@ def test_dump_double_oem(ephem, ephem2, datafile, ccsds_format, helper):
     helper.assert_string(ref, txt)
 
 
+def test_dump_oem_keplerian(ephem, datafile, ccsds_format, helper):
+
+    # The state vectors are always written in cartesian form
+    ephem.form = "keplerian"
+    txt = dumps(ephem, fmt=ccsds_format)
+
+    helper.assert_string(datafile("oem"), txt)
+
+
 def test_dump_oem_linear(ephem, ccsds_format):
 
     ephem.method = ephem.LINEAR
@@ -95,6 +129,44 @@ def test_load_oem(ephem, datafile, helper):
     assert str(e.value) == "Missing mandatory parameter 'REF_FRAME'"
 
 
+def test_load_oem_columns(ephem, raw_datafile, helper):
+    """Accelerations may be given on some lines only, and are discarded"""
+
+    lines = raw_datafile("oem", suffix=".kvn").splitlines()
+    data_idx = [i for i, line in enumerate(lines) if line[:1].isdigit()]
+
+    # Only one line over two has accelerations
+    for i in data_idx[1::2]:
+        lines[i] += "  0.001000  0.002000  0.003000"
+
+    data = loads("\n".join(lines))
+    helper.assert_ephem(ephem, data)
+
+    wrong = list(lines)
+    wrong[data_idx[2]] += "  0.001000"
+    with raises(CcsdsError) as e:
+        loads("\n".join(wrong))
+    assert str(e.value).startswith("Invalid number of values in state vector")
+    assert wrong[data_idx[2]] in str(e.value)
+
+    wrong = list(lines)
+    wrong[data_idx[3]] = wrong[data_idx[3]].replace(" 4", " 4x", 1)
+    with raises(CcsdsError) as e:
+        loads("\n".join(wrong))
+    assert str(e.value) == f"Invalid value in state vector '{wrong[data_idx[3]]}'"
+
+
+def test_load_oem_stream(ephem, raw_datafile, helper):
+
+    data = _loads_kvn(StringIO(raw_datafile("oem", suffix=".kvn")))
+    helper.assert_ephem(ephem, data)
+
+    # Windows-style line endings
+    text = raw_datafile("oem", suffix=".kvn").replace("\n", "\r\n")
+    data = _loads_kvn(StringIO(text, newline=""))
+    helper.assert_ephem(ephem, data)
+
+
 def test_load_oem_minimal(ephem, datafile, helper):
     data = loads(datafile("oem_minimal"))
     helper.assert_ephem(ephem, data)
@@ -1,8 +1,10 @@
+from io import StringIO
 
 from pytest import fixture
 
 from beyond.dates import Date, timedelta
 from beyond.io.ccsds import dumps, loads
+from beyond.io.ccsds.tdm import _loads_kvn
 from beyond.utils.measures import MeasureSet, Range, Azimut, Elevation
 
 
@@ -42,3 +44,28 @@ def test_load(measureset, datafile):
     assert measureset.stop == data.stop
     assert measureset.sources == data.sources
     assert measureset.paths == data.paths
+
+
+def test_load_stream(measureset, raw_datafile):
+
+    data = _loads_kvn(StringIO(raw_datafile("tdm", suffix=".kvn")))
+
+    assert len(measureset) == len(data)
+    assert measureset.start == data.start
+    assert measureset.stop == data.stop
+
+
+def test_load_participants(measureset, datafile):
+    """Participants are identified by their index, not by their position
+    in the metadata
+    """
+
+    txt = datafile("tdm")
+    txt = txt.replace("PARTICIPANT_1 ", "PARTICIPANT_10").replace(
+        "PARTICIPANT_1>", "PARTICIPANT_10>"
+    )
+    txt = txt.replace("1,2,1", "10,2,10")
+
+    data = loads(txt)
+
+    assert measureset.paths == data.paths
@@ -130,3 +130,17 @@ def test_setter(sv):
 
     with raises(KeyError):
         sv[name] = 4
+
+
+def test_form_unchanged(sv):
+
+    ref = sv.base.copy()
+    form = sv.form
+
+    sv.form = form.name
+    assert sv.form is form
+    np.testing.assert_array_equal(sv.base, ref)
+
+    sv.form = form
+    assert sv.form is form
+    np.testing.assert_array_equal(sv.base, ref)
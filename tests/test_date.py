@@ -124,6 +124,9 @@ def test_change_scale():
         t2 = t.change_scale('TT')
         assert str(t2) == "2015-12-06T00:01:08.184000 TT"
 
+        # The conversion is only computed once
+        assert t.change_scale('TT') is t2
+
         t3 = t.change_scale('GPS')
         assert str(t3) == "2015-12-06T00:00:17 GPS"
 